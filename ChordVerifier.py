@@ -3,7 +3,7 @@ Chord Verification
 Verifies if struck strings match a target chord
 """
 
-from typing import Dict, List, Set
+from typing import Dict, List, Set, Tuple
 from guitar import GuitarState
 from target_chord import TargetChord
 
@@ -19,6 +19,10 @@ class ChordVerifier:
         self.target_frets = None
         self.target_strings = None
         self.guitar_state = None
+        # Compiled form of the last target, reused while the same chord is verified
+        self._compiled_frets = None
+        self._compiled_strings = None
+        self._compiled_target = None
     
     def _get_target_frets(self, chord_name: str) -> List[int]:
         """Get the target fret positions for a chord"""
@@ -31,6 +35,66 @@ class ChordVerifier:
             return frets_array
         return []
     
+    @staticmethod
+    def compile_target(target_frets, target_strings, strings_mask=None) -> Tuple[int, int, int, int]:
+        """
+        Compile a target chord into bitmasks matching GuitarState.fret_word / struck_mask
+        
+        Target arrays are indexed low E first while the guitar state is indexed
+        high E first, so chord string i maps to guitar string 5 - i.
+        
+        Args:
+            target_frets: List of fret positions for each string
+            target_strings: List of string indices that should be struck
+            strings_mask: target_strings as a bitmask (e.g. TargetChord.strings_mask),
+                built from target_strings when not given
+        
+        Returns:
+            (fret_lanes, fret_values, required_strings, forbidden_strings)
+        """
+        if strings_mask is None:
+            strings_mask = 0
+            for string_idx in target_strings:
+                strings_mask |= 1 << string_idx
+        fret_lanes = 0
+        fret_values = 0
+        required = 0
+        forbidden = 0
+        for string_idx, fret in enumerate(target_frets):
+            bit = 5 - string_idx
+            should_strike = strings_mask >> string_idx & 1
+            if fret == -1:
+                # Muted string - must not be struck
+                forbidden |= 1 << bit
+            elif fret == 0:
+                # Open string - struck exactly when listed in target_strings
+                if should_strike:
+                    required |= 1 << bit
+                else:
+                    forbidden |= 1 << bit
+            else:
+                # Fretted string - pressed fret must match
+                fret_lanes |= 0xFF << (bit << 3)
+                fret_values |= (fret & 0xFF) << (bit << 3)
+                if should_strike:
+                    required |= 1 << bit
+        return fret_lanes, fret_values, required, forbidden
+    
+    def set_target(self, target_frets, target_strings, compiled=None) -> None:
+        """
+        Cache the target chord used by verify()
+        
+        Args:
+            target_frets: List of fret positions for each string
+            target_strings: List of string indices that should be struck
+            compiled: Masks already built by compile_target() (e.g. TargetChord.compiled)
+        """
+        self._compiled_frets = target_frets
+        self._compiled_strings = target_strings
+        if compiled is None:
+            compiled = self.compile_target(target_frets, target_strings)
+        self._compiled_target = compiled
+    
     def verify(self, target_frets, target_strings, guitar_state) -> bool:
         """
         Verify if struck strings match the target chord
@@ -51,54 +115,62 @@ class ChordVerifier:
         if not target_frets:
             return False
         
-        # Check each string
-        strings_matched = True
-        frets_matched = True
-
-        for string_idx in range(6):
-            pressed_fret = guitar_state.get_fret_pressed(5-string_idx)
-            string_struck = guitar_state.is_string_struck(5-string_idx)
-
-            # Muted string (fret -1) - should not be struck
-            if target_frets[string_idx] == -1:
-                if string_struck:
-                    strings_matched = False
-            # Open string (fret 0) - should be struck if in target_strings
-            elif target_frets[string_idx] == 0:
-                if string_idx in target_strings and not string_struck:
-                    strings_matched = False
-                if string_idx not in target_strings and string_struck:
-                    strings_matched = False
-            # Fretted string - must match target fret
-            else:
-                if pressed_fret != target_frets[string_idx]:
-                    print(f"String {string_idx} fret mismatch: expected {target_frets[string_idx]}, got {pressed_fret}")
-                    frets_matched = False
-                if string_idx in target_strings and not string_struck:
-                    strings_matched = False
-        
-        # print(f"Chord Verification - Frets Matched: {frets_matched}, Strings Matched: {strings_matched}")   
+        strings_matched, frets_matched = self.fast_match(target_frets, target_strings, guitar_state)
         return (frets_matched, strings_matched)
     
-   
+    def fast_match(self, target_frets, target_strings, guitar_state) -> Tuple[bool, bool]:
+        """
+        Match the guitar state against the target chord without any error bookkeeping
+        
+        Args:
+            target_frets: List of fret positions for each string
+            target_strings: List of string indices that should be struck
+            guitar_state: Current guitar state
+            
+        Returns:
+            (strings_matched, frets_matched)
+        """
+        if target_frets is not self._compiled_frets or target_strings is not self._compiled_strings:
+            self.set_target(target_frets, target_strings)
+        fret_lanes, fret_values, required, forbidden = self._compiled_target
+        
+        frets_matched = (guitar_state.fret_word & fret_lanes) == fret_values
+        struck = guitar_state.struck_mask
+        strings_matched = not (struck & forbidden) and (struck & required) == required
+        
+        return (strings_matched, frets_matched)
     
     def get_errors(self) -> Dict[int, str]:
         """
-        Get detailed errors for each string
+        Get detailed errors for each string of the last verified chord
         
+        Returns:
+            Dictionary mapping string index to error message
+        """
+        return self.compute_errors(self.target_frets, self.guitar_state)
+    
+    @staticmethod
+    def compute_errors(target_frets, guitar_state) -> Dict[int, str]:
+        """
+        Build detailed errors for each string (only needed when a chord was played wrong)
+        
+        Args:
+            target_frets: List of fret positions for each string
+            guitar_state: Current guitar state
+            
         Returns:
             Dictionary mapping string index to error message
         """
         errors = {}
         
-        if not self.target_frets:
+        if not target_frets:
             return errors
         
         for string_idx in range(6):
             t_index = string_idx
-            target_fret = self.target_frets[5 - t_index]
-            pressed_fret = self.guitar_state.get_fret_pressed(t_index)
-            struck = self.guitar_state.is_string_struck(5-t_index)
+            target_fret = target_frets[5 - t_index]
+            pressed_fret = guitar_state.get_fret_pressed(t_index)
+            struck = guitar_state.is_string_struck(5-t_index)
             if target_fret == 0:
                 if not struck:
                     errors[t_index] = f"String {t_index} should be struck open"
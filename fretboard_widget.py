@@ -1,10 +1,17 @@
 """Guitar fretboard display widget"""
 import json
+from array import array
 from PySide6.QtWidgets import QFrame
 from PySide6.QtGui import QPixmap, QPainter, QColor, QFont, QBrush, QPen
-from PySide6.QtCore import Signal, QTimer, Qt, QSize
+from PySide6.QtCore import Signal, QTimer, Qt, QSize, QRect
 from guitar import GuitarState
 
+# Display option bits for FretboardWidget.set_display_flags()
+FLAG_FEEDBACK = 1  # Show CORRECT / INCORRECT feedback
+FLAG_TARGET = 2    # Show target chord frets and strings to strike
+FLAG_NEXT = 4      # Show the next chord in the practice queue
+FLAG_NAME = 8      # Show the current chord name
+
 
 class FretboardWidget(QFrame):
     """Custom widget to draw the guitar fretboard"""
@@ -23,12 +30,15 @@ class FretboardWidget(QFrame):
         self.next_chord_name = None  # Name of the next chord
 
         self.guitar_state = GuitarState()
+        self._live_frets = array('b', [0] * 6)  # Pressed fret per string as last drawn (0 = none)
+        self._string_rects = []  # Repaint strip for each string (computed in paintEvent)
 
         # Initialize config values (will be set by load_config)
         self.STANDARD_TUNING = [40, 45, 50, 55, 59, 64]  # Default
         self.NUM_FRETS = 24
         self.NUM_STRINGS = 6
         self.CHORD_PRESETS = {}
+        self.CHORD_NAMES = ()  # Preset names in config order, built once with CHORD_PRESETS
 
         # Initialize image and config
         self.guitar_image = QPixmap()
@@ -45,19 +55,29 @@ class FretboardWidget(QFrame):
         self.feedback_text = ""  # "CORRECT" or "INCORRECT"
         self.feedback_color = "green"  # "green" or "red"
         
-        # Show target display
-        self.show_target = True  # Whether to display target chord frets
-        
-        # Show next chord display
-        self.show_next_chord = False  # Whether to display next chord in queue
+        # Display options (FLAG_* bits)
+        self.display_flags = FLAG_FEEDBACK | FLAG_TARGET | FLAG_NAME
         
-        # Show chord name display
-        self.show_chord_name = True  # Whether to display the current chord name
-        
-        # Setup timer for periodic repaint (thread-safe)
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update)
-        self.update_timer.start(50)  # Update every 50ms
+        # Paint objects are created once and reused by every paintEvent
+        self._background_color = QColor(240, 240, 240)
+        self._title_font = QFont('Arial', 16, QFont.Bold)
+        self._marker_font = QFont('Arial', 14, QFont.Bold)
+        self._feedback_font = QFont('Arial', 48, QFont.Bold)
+        self._brush_target = QBrush(QColor(100, 150, 255, 180))
+        self._pen_target = QPen(QColor(50, 100, 200), 2)
+        self._brush_next = QBrush(QColor(255, 255, 0, 150))
+        self._pen_next = QPen(QColor(200, 200, 0), 2)
+        self._pen_pressed = QPen(QColor(200, 0, 0), 3)
+        self._brush_correct = QBrush(QColor(0, 255, 0, 200))
+        self._brush_wrong = QBrush(QColor(255, 0, 0, 200))
+        self._brush_next_match = QBrush(QColor(255, 255, 100, 220))
+        self._pen_next_match = QPen(QColor(200, 200, 0), 1)
+        self._brush_struck = QBrush(QColor(0, 200, 0, 180))
+        self._pen_struck = QPen(QColor(0, 150, 0), 6)
+        self._pen_open_marker = QPen(QColor(0, 150, 0), 3)
+        self._pen_muted_marker = QPen(QColor(200, 0, 0), 3)
+        self._color_correct = QColor(0, 200, 0)
+        self._color_incorrect = QColor(255, 0, 0)
     
     def load_config(self):
         """Load guitar configuration from JSON"""
@@ -79,6 +99,7 @@ class FretboardWidget(QFrame):
             # Build CHORD_PRESETS from chord_shapes in config
             chord_shapes = self.config.get('chord_shapes', {})
             self.CHORD_PRESETS = {name: {0: frets} for name, frets in chord_shapes.items()}
+            self.CHORD_NAMES = tuple(self.CHORD_PRESETS)
                 
             # Extract fret and string positions from JSON
             image_config = self.config.get('image', {})
@@ -136,11 +157,27 @@ class FretboardWidget(QFrame):
         self.string_positions = []
         self.fret_positions = []
         
+        # Scaled background image, rebuilt only when the available size changes
+        self._scaled_image = None
+        self._scaled_image_key = None
+        
     def set_guitar_state(self, guitar_state: GuitarState):
         """Set the current guitar state for display"""
         self.guitar_state = guitar_state
+        for string_idx in range(6):
+            self._live_frets[string_idx] = guitar_state.get_fret_pressed(string_idx)
         self.update()
     
+    def apply_delta(self, string, fret):
+        """Update a single string and repaint only its strip of the fretboard"""
+        if not 0 <= string < 6:
+            return
+        self._live_frets[string] = fret
+        if string < len(self._string_rects):
+            self.update(self._string_rects[string])
+        else:
+            self.update()
+    
     def set_chord(self, chord_name, strings_to_strike=None):
         """Set the chord to display"""
         self.chord_name = chord_name
@@ -148,6 +185,7 @@ class FretboardWidget(QFrame):
         if chord_name in self.CHORD_PRESETS:
             self.chord_frets = self.CHORD_PRESETS[chord_name]
             self.guitar_state.clear_all()
+            self._live_frets = array('b', [0] * 6)
         self.update()
     
     def set_feedback(self, text, color):
@@ -156,9 +194,11 @@ class FretboardWidget(QFrame):
         self.feedback_color = color
         self.update()
     
-    def set_show_target(self, show):
-        """Set whether to show target chord frets and strings to strike"""
-        self.show_target = show
+    def set_display_flags(self, flags):
+        """Set which optional elements are drawn (FLAG_* bits), repainting only on change"""
+        if flags == self.display_flags:
+            return
+        self.display_flags = flags
         self.update()
     
     def set_next_chord(self, chord_name, frets):
@@ -167,16 +207,6 @@ class FretboardWidget(QFrame):
         self.next_chord_frets = {0: frets} if frets else {}
         self.update()
     
-    def set_show_next_chord(self, show):
-        """Set whether to show the next chord in the practice queue"""
-        self.show_next_chord = show
-        self.update()
-    
-    def set_show_chord_name(self, show):
-        """Set whether to show the current chord name"""
-        self.show_chord_name = show
-        self.update()
-    
     def get_fret_for_note(self, midi_note):
         """Convert MIDI note to (string, fret) position"""
         for string_idx, open_note in enumerate(self.STANDARD_TUNING):
@@ -193,12 +223,19 @@ class FretboardWidget(QFrame):
         width = self.width()
         height = self.height()
         
+        # Feedback (when enabled) also reveals the target and the chord name
+        flags = self.display_flags
+        feedback_text = self.feedback_text if flags & FLAG_FEEDBACK else ""
+        show_target = flags & FLAG_TARGET or feedback_text
+        show_next_chord = flags & FLAG_NEXT
+        show_chord_name = flags & FLAG_NAME or feedback_text
+        
         # Draw background
-        painter.fillRect(0, 0, width, height, QColor(240, 240, 240))
+        painter.fillRect(0, 0, width, height, self._background_color)
         
         # Draw title and chord name (centered)
-        painter.setFont(QFont('Arial', 16, QFont.Bold))
-        if (self.show_chord_name or self.feedback_text) and self.chord_name:
+        painter.setFont(self._title_font)
+        if show_chord_name and self.chord_name:
             title_text = f"Guitar Fretboard - {self.chord_name}"
         else:
             title_text = "Guitar Fretboard"
@@ -209,12 +246,16 @@ class FretboardWidget(QFrame):
             max_width = width - 20
             max_height = height - 60
             
-            # Scale maintaining aspect ratio
-            scaled_image = self.guitar_image.scaledToWidth(max_width, Qt.SmoothTransformation)
-            
-            # If scaled image is too tall, scale by height instead
-            if scaled_image.height() > max_height:
-                scaled_image = self.guitar_image.scaledToHeight(max_height, Qt.SmoothTransformation)
+            # Scale maintaining aspect ratio (cached until the widget is resized)
+            if self._scaled_image_key != (max_width, max_height):
+                scaled_image = self.guitar_image.scaledToWidth(max_width, Qt.SmoothTransformation)
+                
+                # If scaled image is too tall, scale by height instead
+                if scaled_image.height() > max_height:
+                    scaled_image = self.guitar_image.scaledToHeight(max_height, Qt.SmoothTransformation)
+                self._scaled_image = scaled_image
+                self._scaled_image_key = (max_width, max_height)
+            scaled_image = self._scaled_image
             
             img_width = scaled_image.width()
             img_height = scaled_image.height()
@@ -230,9 +271,9 @@ class FretboardWidget(QFrame):
             scale_y = img_height / self.guitar_image.height() if self.guitar_image.height() > 0 else 1
             
             # Draw chord dots (practice target) - light blue with transparency (only if show_target is True)
-            if self.chord_frets and (self.show_target or self.feedback_text):
-                painter.setBrush(QBrush(QColor(100, 150, 255, 180)))
-                painter.setPen(QPen(QColor(50, 100, 200), 2))
+            if self.chord_frets and show_target:
+                painter.setBrush(self._brush_target)
+                painter.setPen(self._pen_target)
                 
                 # chord_frets is {0: [fret0, fret1, fret2, fret3, fret4, fret5]}
                 for root_pos, frets_array in self.chord_frets.items():
@@ -250,9 +291,9 @@ class FretboardWidget(QFrame):
                         pass
             
             # Draw next chord dots (yellow) - shows the upcoming chord in the practice queue
-            if self.next_chord_frets and self.show_next_chord:
-                painter.setBrush(QBrush(QColor(255, 255, 0, 150)))  # Yellow with transparency
-                painter.setPen(QPen(QColor(200, 200, 0), 2))
+            if self.next_chord_frets and show_next_chord:
+                painter.setBrush(self._brush_next)  # Yellow with transparency
+                painter.setPen(self._pen_next)
                 
                 # next_chord_frets is {0: [fret0, fret1, fret2, fret3, fret4, fret5]}
                 for root_pos, frets_array in self.next_chord_frets.items():
@@ -270,10 +311,20 @@ class FretboardWidget(QFrame):
           
 
 
+            # Cache the repaint strip of each string so apply_delta can invalidate just that string
+            string_rects = []
+            for string_idx in range(min(self.NUM_STRINGS, len(self.verticalA_positions), len(self.verticalB_positions))):
+                y1 = img_y + self.verticalA_positions[string_idx] * scale_y
+                y2 = img_y + self.verticalB_positions[string_idx] * scale_y
+                top = int(min(y1, y2)) - 12
+                bottom = int(max(y1, y2)) + 12
+                string_rects.append(QRect(0, top, width, bottom - top))
+            self._string_rects = string_rects
+
             # Draw pressed notes (active frets) - green if correct, red if wrong
-            painter.setPen(QPen(QColor(200, 0, 0), 3))
+            painter.setPen(self._pen_pressed)
             for string_idx in range(self.NUM_STRINGS):
-                fret = self.guitar_state.get_fret_pressed(string_idx)
+                fret = self._live_frets[string_idx]
                 if fret > 0:
                     y = img_y + self.verticalA_positions[string_idx] * scale_y
                     x = img_x + (self.horizontal_positions[fret] - 5)* scale_x
@@ -288,25 +339,25 @@ class FretboardWidget(QFrame):
                     
                     # Color green if correct chord fret, red if wrong
                     if is_correct:
-                        painter.setBrush(QBrush(QColor(0, 255, 0, 200)))  # Green for correct
+                        painter.setBrush(self._brush_correct)  # Green for correct
                     else:
-                        painter.setBrush(QBrush(QColor(255, 0, 0, 200)))  # Red for wrong
+                        painter.setBrush(self._brush_wrong)  # Red for wrong
                     
                     painter.drawEllipse(int(x - dot_size), int(y - dot_size), dot_size * 2, dot_size * 2)
                     
                     # Check if this pressed note matches any note in the next chord (only if show_next_chord is enabled)
-                    if self.next_chord_frets and self.show_next_chord:
+                    if self.next_chord_frets and show_next_chord:
                         expected_next_fret = self.next_chord_frets.get(0, [])[5-string_idx] if 0 in self.next_chord_frets else -1
                         if fret == expected_next_fret and expected_next_fret > 0:
                             # Draw a smaller yellow circle to show it matches the next chord
-                            painter.setBrush(QBrush(QColor(255, 255, 100, 220)))  # Bright yellow
-                            painter.setPen(QPen(QColor(200, 200, 0), 1))
+                            painter.setBrush(self._brush_next_match)  # Bright yellow
+                            painter.setPen(self._pen_next_match)
                             small_dot_size = 4
                             painter.drawEllipse(int(x - small_dot_size), int(y - small_dot_size), small_dot_size * 2, small_dot_size * 2)
 
             # Draw struck strings (active strings) - green
-            painter.setBrush(QBrush(QColor(0, 200, 0, 180)))
-            painter.setPen(QPen(QColor(0, 150, 0), 6))
+            painter.setBrush(self._brush_struck)
+            painter.setPen(self._pen_struck)
             for string_idx in range(self.NUM_STRINGS):
                 if self.guitar_state.is_string_struck(string_idx):
                     y1 = img_y + self.verticalA_positions[string_idx] * scale_y
@@ -316,33 +367,33 @@ class FretboardWidget(QFrame):
                     painter.drawLine(int(x0), int(y1), int(x1), int(y2))
 
             # Draw string strike indicators (marks on the left side of the fretboard) (shown if show_target is True or feedback is displayed)
-            if self.chord_frets and (self.show_target or self.feedback_text):
+            if self.chord_frets and show_target:
                 for string_idx in range(self.NUM_STRINGS):
                     y = img_y + (self.verticalA_positions[string_idx]  - 5) * scale_y 
                     x = img_x + (self.horizontal_positions[0]) * scale_x
                     
                     if self.chord_frets.get(0, [])[5-string_idx] == 0:
                         # Draw a checkmark for strings that should be struck
-                        painter.setPen(QPen(QColor(0, 150, 0), 3))  # Green
-                        painter.setFont(QFont('Arial', 14, QFont.Bold))
+                        painter.setPen(self._pen_open_marker)  # Green
+                        painter.setFont(self._marker_font)
                         painter.drawText(int(x), int(y), 40, 20, Qt.AlignCenter, 'O')
                     elif self.chord_frets.get(0, [])[5-string_idx] == -1:
                         # Draw an X for strings that should NOT be struck (muted)
-                        painter.setPen(QPen(QColor(200, 0, 0), 3))  # Red
-                        painter.setFont(QFont('Arial', 14, QFont.Bold))
+                        painter.setPen(self._pen_muted_marker)  # Red
+                        painter.setFont(self._marker_font)
                         painter.drawText(int(x), int(y), 40, 20, Qt.AlignCenter, '✕')
 
             # Draw feedback (CORRECT/INCORRECT)
-            if self.feedback_text:
-                painter.setFont(QFont('Arial', 48, QFont.Bold))
+            if feedback_text:
+                painter.setFont(self._feedback_font)
                 # Set color based on feedback
                 if self.feedback_color == "green":
-                    color = QColor(0, 200, 0)  # Green for CORRECT
+                    color = self._color_correct  # Green for CORRECT
                 else:
-                    color = QColor(255, 0, 0)  # Red for INCORRECT
+                    color = self._color_incorrect  # Red for INCORRECT
                 painter.setPen(color)
                 # Draw feedback text at the top of the widget
-                painter.drawText(0, 30, width, 80, Qt.AlignCenter, self.feedback_text)
+                painter.drawText(0, 30, width, 80, Qt.AlignCenter, feedback_text)
                     
         except Exception as e:
             print(f"Error drawing guitar image: {e}")
@@ -14,21 +14,33 @@ class GuitarState:
     def __init__(self, num_strings: int = 6):
         self.pressed_frets = [0] * num_strings   # string -> set of frets
         self.strings_struck = [None] * num_strings        
+        # Packed mirrors of the lists above, kept in sync in place so chord
+        # verification is a couple of integer ops instead of a per-string loop
+        self.fret_word = 0     # 8 bits per string: fret pressed on string n at bits 8n..8n+7
+        self.struck_mask = 0   # bit n set when string n has been struck
+        self._summary = None   # Cached get_summary() result, reset by every mutation
     
     def press_fret(self, string: int, fret: int) -> None:
         """Record a fret being pressed"""
         if 0 <= string < 6 and fret >= 0:
             self.pressed_frets[string] = fret
+            shift = string << 3
+            self.fret_word = (self.fret_word & ~(0xFF << shift)) | ((fret & 0xFF) << shift)
+            self._summary = None
     
     def release_fret(self, string: int, fret: int) -> None:
         """Record a fret being released"""
         if 0 <= string < 6 and fret >= 0:
             self.pressed_frets[string] = 0
+            self.fret_word &= ~(0xFF << (string << 3))
+            self._summary = None
     
     def strike_string(self, string: int, fret: int) -> None:
         """Record a string being struck"""
         if 0 <= string < 6:
             self.strings_struck[string] = fret
+            self.struck_mask |= 1 << string
+            self._summary = None
     
     def release_string(self, string: int) -> None:
         """Record a string being released after being struck"""
@@ -41,10 +53,15 @@ class GuitarState:
         """Clear all pressed frets and struck strings"""
         self.pressed_frets = [0] * 6
         self.strings_struck = [None] * 6
+        self.fret_word = 0
+        self.struck_mask = 0
+        self._summary = None
 
     def clear_strings(self) -> None:
         """Clear all struck strings"""
         self.strings_struck = [None] * 6
+        self.struck_mask = 0
+        self._summary = None
 
     
     def is_string_struck(self, string: int) -> bool:
@@ -55,9 +72,15 @@ class GuitarState:
         """Check if a fret is currently pressed on a string"""
         return self.pressed_frets[string]
     
+    def state_key(self) -> int:
+        """Get a single integer that changes whenever the pressed frets or struck strings change"""
+        return (self.fret_word << 6) | self.struck_mask
+    
     def get_summary(self) -> Dict:
-        """Get a summary of the current guitar state"""
-        return {
-            'pressed_frets': self.pressed_frets,
-            'strings_struck': self.strings_struck,
-        }
\ No newline at end of file
+        """Get a summary of the current guitar state (rebuilt only after a change)"""
+        if self._summary is None:
+            self._summary = {
+                'pressed_frets': list(self.pressed_frets),
+                'strings_struck': list(self.strings_struck),
+            }
+        return self._summary
\ No newline at end of file
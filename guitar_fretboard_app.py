@@ -5,17 +5,21 @@ Supports both standard MIDI and Bluetooth LE (Aeroband)
 Uses JSON configuration for fret positions
 """
 
+import os
 import sys
+import json
+import logging
 import threading
 import asyncio
+from pathlib import Path
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                                 QHBoxLayout, QLabel, QComboBox, QPushButton, QTabWidget, QCheckBox)
-from PySide6.QtCore import Qt, QTimer, Signal, QObject, QSize, QCoreApplication, QThread, QMetaObject, Slot
+from PySide6.QtCore import Qt, QTimer, Signal, QObject, QSize, QCoreApplication, Slot
 from PySide6.QtGui import QPainter, QColor, QFont, QPen, QBrush
 from PySide6.QtWidgets import QFrame
 
-from fretboard_widget import FretboardWidget
-from midi_handler import MIDIHandler
+from fretboard_widget import FretboardWidget, FLAG_FEEDBACK, FLAG_TARGET, FLAG_NEXT, FLAG_NAME
+from midi_handler import MIDIHandler, NOTE_ON, NOTE_OFF, CONTROL_CHANGE, FRET_TABLE
 from guitar import GuitarState
 from ChordVerifier import ChordVerifier
 from practice_library import PracticeLibrary
@@ -28,11 +32,29 @@ except ImportError:
     BLEAK_AVAILABLE = False
     print("Warning: bleak not installed. Bluetooth support disabled.")
 
+# Optional libuv-based event loop for the BLE thread (winloop on Windows, uvloop elsewhere)
+try:
+    import winloop as fast_loop
+except ImportError:
+    try:
+        import uvloop as fast_loop
+    except ImportError:
+        fast_loop = None
+
+# Remembers the last connected Aeroband so startup can skip the full scan
+DEVICE_CACHE_PATH = Path.home() / '.winguitar_cache.json'
+# BLE scan window in seconds (bleak's default is 5)
+SCAN_TIMEOUT = 2.0
+# Set WINGUITAR_TRACE=1 to print every MIDI event and guitar state
+TRACE = os.environ.get('WINGUITAR_TRACE') == '1'
+
 
 class GuitarFretboardApp(QMainWindow):
     # Signals for thread-safe communication from worker thread
     status_changed = Signal(str)  # Emits status text
     style_changed = Signal(str)   # Emits stylesheet
+    reconnect_requested = Signal()  # Scan failed, retry after the backoff delay
+    device_ready = Signal()         # Aeroband found, start the MIDI thread
     
     def __init__(self):
         super().__init__()
@@ -51,24 +73,44 @@ class GuitarFretboardApp(QMainWindow):
         
         self.setGeometry(x, y, width, height)
         self.guitar_state = GuitarState()
+        self.verifier = ChordVerifier()
         
         
-        # MIDI handler
+        # MIDI handler - BLE messages arrive through midi_handler.event_ring (drained by
+        # a timer below); the signals are still used by the standard MIDI path
         self.midi_handler = MIDIHandler()
         self.midi_handler.midi_note_received.connect(self.on_note_pressed)
         self.midi_handler.midi_note_released.connect(self.on_note_released)
         self.midi_handler.fret_pressed.connect(self.on_fret_pressed)
         self.midi_handler.fret_released.connect(self.on_fret_released)
         
+        # Logging - the log file stays open instead of being reopened for every message
+        self._logger = logging.getLogger('winguitar')
+        if not self._logger.handlers:
+            self._logger.addHandler(logging.FileHandler('guitar_app.log', encoding='utf-8'))
+            if TRACE:
+                self._logger.addHandler(logging.StreamHandler(sys.stdout))
+        self._logger.setLevel(logging.DEBUG if TRACE else logging.INFO)
+        
         # Device info
         self.ble_devices = {}
         self.aeroband_address = None
         self.aeroband_name = None
         
+        # Reconnect backoff (doubles after each failed scan, reset once the Aeroband is seen)
+        self._retry_delay_ms = 5000
+        self._scan_paused = False  # Scan skipped while the app was in the background
+        
+        # One persistent asyncio loop on a background thread runs every BLE scan
+        self.ble_loop = fast_loop.new_event_loop() if fast_loop else asyncio.new_event_loop()
+        self._ble_loop_thread = threading.Thread(target=self.ble_loop.run_forever, daemon=True)
+        self._ble_loop_thread.start()
+        
         # Practice mode state (initialize early, before UI creation)
         self.practice_chords = []   # List of chords to practice
         self.current_practice_idx = 0  # Current chord index
         self.practice_name = ""  # Current practice name
+        self._current_chord = 'None'  # Mirrors chord_combo text without a Qt round-trip
         
         # Create UI
         central_widget = QWidget()
@@ -77,6 +119,7 @@ class GuitarFretboardApp(QMainWindow):
         
         # Create fretboard first so we can access its CHORD_PRESETS
         self.fretboard = FretboardWidget()
+        self.fretboard.set_guitar_state(self.guitar_state)
         
         # Control panel (simplified)
         control_layout = QHBoxLayout()
@@ -95,7 +138,7 @@ class GuitarFretboardApp(QMainWindow):
         # Chord selector
         control_layout.addWidget(QLabel("Chord:"))
         self.chord_combo = QComboBox()
-        self.chord_combo.addItems(['None'] + list(self.fretboard.CHORD_PRESETS.keys()))
+        self.chord_combo.addItems(('None',) + self.fretboard.CHORD_NAMES)
         self.chord_combo.setCurrentText('E Major')
         self.chord_combo.currentTextChanged.connect(self.on_chord_changed)
         control_layout.addWidget(self.chord_combo)
@@ -103,25 +146,27 @@ class GuitarFretboardApp(QMainWindow):
         # Feedback checkbox
         self.feedback_checkbox = QCheckBox("Show Feedback")
         self.feedback_checkbox.setChecked(True)
+        self.feedback_checkbox.stateChanged.connect(self._on_display_flag_changed)
         control_layout.addWidget(self.feedback_checkbox)
         
         # Show target checkbox
         self.show_target_checkbox = QCheckBox("Show Target")
         self.show_target_checkbox.setChecked(True)
-        self.show_target_checkbox.stateChanged.connect(self.on_show_target_changed)
+        self.show_target_checkbox.stateChanged.connect(self._on_display_flag_changed)
         control_layout.addWidget(self.show_target_checkbox)
         
         # Show next chord checkbox
         self.show_next_chord_checkbox = QCheckBox("Show Next Chord")
         self.show_next_chord_checkbox.setChecked(False)
-        self.show_next_chord_checkbox.stateChanged.connect(self.on_show_next_chord_changed)
+        self.show_next_chord_checkbox.stateChanged.connect(self._on_display_flag_changed)
         control_layout.addWidget(self.show_next_chord_checkbox)
         
         # Show chord name checkbox
         self.show_chord_name_checkbox = QCheckBox("Show Chord Name")
         self.show_chord_name_checkbox.setChecked(True)
-        self.show_chord_name_checkbox.stateChanged.connect(self.on_show_chord_name_changed)
+        self.show_chord_name_checkbox.stateChanged.connect(self._on_display_flag_changed)
         control_layout.addWidget(self.show_chord_name_checkbox)
+        self._on_display_flag_changed()  # Sync the fretboard with the initial checkbox states
         
         control_layout.addStretch()
         
@@ -146,14 +191,15 @@ class GuitarFretboardApp(QMainWindow):
         if self.practice_combo.count() > 0:
             self.on_practice_changed(self.practice_combo.currentText())
         
-        # MIDI thread (use QThread to host the QObject)
-        self.midi_thread = None
-        
         # Connect signals to slots for thread-safe UI updates
         self.status_changed.connect(self.status_label.setText)
         self.style_changed.connect(self.status_label.setStyleSheet)
+        # Emitted on the BLE loop thread, so these are delivered queued on the main thread
+        self.reconnect_requested.connect(self._schedule_reconnect)
+        self.device_ready.connect(self._on_listener_started)
         
         # Auto-connect to Aeroband on startup
+        QApplication.instance().applicationStateChanged.connect(self._on_application_state_changed)
         QTimer.singleShot(500, self.auto_connect_aeroband)
 
         # Chord detection timer
@@ -161,45 +207,97 @@ class GuitarFretboardApp(QMainWindow):
         self.chord_timer.setSingleShot(True)  # Timer fires once then stops
         self.chord_timer.timeout.connect(self.finished_chord)
         self.chord_timeout_ms = 250  # 250ms timeout
-        self.verifier = ChordVerifier()
+        
+        # Drain midi_handler.event_ring when the BLE thread signals new events
+        # (emitted from another thread, so it arrives queued on the UI thread)
+        self.midi_handler.events_ready.connect(self._drain_midi)
         
         # Feedback state
         self.feedback_text = ""  # "CORRECT" or "INCORRECT"
         self.feedback_color = "green"  # "green" or "red"
         self.should_advance_chord = False  # Flag to advance to next chord after feedback
+        self._last_render_key = None  # (guitar state key, feedback) last pushed to the fretboard
 
 
     
     def _log(self, msg):
         """Log to file and console"""
-        print(msg)
-        try:
-            with open('guitar_app.log', 'a') as f:
-                f.write(msg + '\n')
-        except:
-            pass
+        if not TRACE:
+            # With WINGUITAR_TRACE the logger's stdout handler already prints it
+            print(msg)
+        self._logger.info(msg)
     
     @Slot()
-    def _start_midi_thread(self):
-        """Start MIDI listening thread (must be called from main thread)"""
+    def _drain_midi(self):
+        """Apply all MIDI messages queued by the BLE thread as one batch (runs on the UI thread)"""
+        # Cleared first so messages queued while draining schedule another wake-up
+        self.midi_handler.wake_pending = False
+        ring = self.midi_handler.event_ring
+        if not ring:
+            return
+        
+        # Bound once per batch rather than looked up for every message
+        pop = ring.popleft
+        fret_table = FRET_TABLE
+        gs = self.guitar_state
+        strike = gs.strike_string
+        press = gs.press_fret
+        release_str = gs.release_string
+        release_fret = gs.release_fret
+        
+        touched = 0  # Bitmask of strings changed by this batch
+        struck = False
+        fret_released = False
+        while ring:
+            packed = pop()
+            status = packed >> 16
+            command = status & 0xF0
+            string = status & 0x0F
+            if string > 5:
+                # Channels past the six strings have no fret to look up
+                continue
+            data1 = (packed >> 8) & 0xFF
+            data2 = packed & 0xFF
+            
+            if command == NOTE_ON and data2 > 0:
+                fret = fret_table[(string << 7) | data1]
+                string = 5 - string
+                strike(string, fret)
+                press(string, fret)
+                struck = True
+            elif command == NOTE_ON or command == NOTE_OFF:
+                # Note on with velocity 0 = note off
+                release_str(string)
+            elif command == CONTROL_CHANGE:
+                if data1 & 0x01:
+                    press(string, data2)
+                else:
+                    release_fret(string, data2)
+                    fret_released = True
+            else:
+                continue
+            touched |= 1 << string
+        
+        if TRACE:
+            self._logger.debug("Current Guitar State: %s", gs.get_summary())
+        
+        # Arm the chord timer once per batch (a strum usually arrives as one packet)
+        if struck:
+            self.chord_timer.start(self.chord_timeout_ms)
+        
+        if fret_released and not gs.fret_word:
+            self._on_all_frets_released()
+        else:
+            # The fretboard no longer shows what _state_changed() last rendered
+            self._last_render_key = None
+            for string in range(6):
+                if touched >> string & 1:
+                    self.fretboard.apply_delta(string, gs.get_fret_pressed(string))
+    
+    @Slot()
+    def _on_listener_started(self):
+        """Report the BLE listener started on the BLE loop (runs on the main thread)"""
         if self.midi_handler.running:
-            # If an existing thread exists, stop it first
-            try:
-                if self.midi_thread and isinstance(self.midi_thread, QThread):
-                    self.midi_handler.stop()
-                    self.midi_thread.quit()
-                    self.midi_thread.wait(2000)
-            except Exception:
-                pass
-
-            self.midi_thread = QThread()
-            # Move the QObject to the QThread so its timers/signals are associated with a QThread
-            self.midi_handler.moveToThread(self.midi_thread)
-            # When thread starts, call the blocking listen() method (will run in this thread)
-            self.midi_thread.started.connect(self.midi_handler.listen)
-            self.midi_thread.start()
-
-            # Emit signals (we're on main thread now)
             self.status_changed.emit(f"Connected: {self.aeroband_name}")
             self.style_changed.emit("color: green; font-weight: bold;")
             self._log("Successfully connected!")
@@ -211,49 +309,67 @@ class GuitarFretboardApp(QMainWindow):
     
     def auto_connect_aeroband(self):
         """Automatically scan for and connect to Aeroband"""
+        if QApplication.applicationState() != Qt.ApplicationState.ApplicationActive:
+            # Don't spend BLE scan windows while minimized/in the background
+            self._scan_paused = True
+            self._log("App inactive, pausing Aeroband scan")
+            self.status_label.setText("Scan paused")
+            return
+        
         self._log("Auto-connecting to Aeroband...")
         self.status_label.setText("Scanning for Aeroband...")
         
-        # Scan in background thread
-        threading.Thread(target=self._scan_and_connect, daemon=True).start()
+        # Scan on the background BLE loop
+        asyncio.run_coroutine_threadsafe(self._scan_and_connect(), self.ble_loop)
     
-    def _scan_and_connect(self):
-        """Background thread to scan and connect"""
+    async def _scan_and_connect(self):
+        """Scan for and connect to the Aeroband (runs on the BLE loop thread)"""
         try:
-            self._log("Starting BLE scan...")
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            devices = loop.run_until_complete(BleakScanner.discover())
-            
-            self._log(f"Found {len(devices)} devices")
-            
             aeroband = None
-            for device in devices:
-                self._log(f"  Device: {device.name} ({device.address})")
-                # Look for Aeroband devices
-                if device.name and ('aeroband' in device.name.lower() or 'guitar' in device.name.lower()):
-                    aeroband = device
-                    self._log(f"    -> Found Aeroband!")
-                    break
+            cached_address = self._load_cached_address()
+            if cached_address:
+                # Fast path: wait only for the last used device to advertise
+                self._log(f"Looking for last used Aeroband at {cached_address}...")
+                aeroband = await BleakScanner.find_device_by_address(cached_address, timeout=SCAN_TIMEOUT)
+            
+            if not aeroband:
+                self._log("Starting BLE scan...")
+                devices = await BleakScanner.discover(timeout=SCAN_TIMEOUT)
+                
+                self._log(f"Found {len(devices)} devices")
+                
+                for device in devices:
+                    self._log(f"  Device: {device.name} ({device.address})")
+                    # Look for Aeroband devices
+                    if device.name and ('aeroband' in device.name.lower() or 'guitar' in device.name.lower()):
+                        aeroband = device
+                        self._log(f"    -> Found Aeroband!")
+                        break
             
             if not aeroband:
                 # Emit signal from worker thread (thread-safe)
                 self.status_changed.emit("Aeroband not found - retrying...")
-                self._log("No Aeroband found, will retry in 5 seconds")
+                self._log("No Aeroband found")
                 # Schedule retry on the main thread
-                QMetaObject.invokeMethod(self, "auto_connect_aeroband", Qt.ConnectionType.QueuedConnection)
+                self.reconnect_requested.emit()
                 return
             
+            # Device is around - retry quickly again if the connection fails
+            self._retry_delay_ms = 5000
+
             self.aeroband_address = aeroband.address
-            self.aeroband_name = aeroband.name  # Store for later use in _start_midi_thread
+            self.aeroband_name = aeroband.name  # Store for later use in _on_listener_started
             self._log(f"Connecting to {aeroband.name} at {aeroband.address}")
             # Emit signal from worker thread (thread-safe)
             self.status_changed.emit(f"Connecting to {aeroband.name}...")
             
-            # Start listening (call _start_midi_thread on main thread to set up QThread)
-            if self.midi_handler.start_listening_ble(aeroband.address):
-                # Schedule MIDI thread setup on the main thread (required for moveToThread)
-                QMetaObject.invokeMethod(self, "_start_midi_thread", Qt.ConnectionType.QueuedConnection)
+            # Start listening on this same loop
+            # Passing the discovered device lets the client connect without scanning again
+            if self.midi_handler.start_listening_ble(aeroband):
+                self._save_cached_address(aeroband.address)
+                await self.midi_handler.listen_ble()
+                # Update the status on the main thread
+                self.device_ready.emit()
             else:
                 # Emit signals from worker thread (thread-safe)
                 self.status_changed.emit("Failed to connect")
@@ -265,30 +381,58 @@ class GuitarFretboardApp(QMainWindow):
             # Emit signals from worker thread (thread-safe)
             self.status_changed.emit(f"Error: {str(e)[:30]}")
             self.style_changed.emit("color: red; font-weight: bold;")
-            QMetaObject.invokeMethod(self, "auto_connect_aeroband", Qt.ConnectionType.QueuedConnection)
+            self.reconnect_requested.emit()
+    
+    def _load_cached_address(self):
+        """Return the address of the last connected Aeroband, or None"""
+        try:
+            return json.loads(DEVICE_CACHE_PATH.read_text()).get('aeroband_address')
+        except (OSError, ValueError, AttributeError):
+            return None
+    
+    def _save_cached_address(self, address):
+        """Remember the Aeroband address for the next startup"""
+        try:
+            DEVICE_CACHE_PATH.write_text(json.dumps({'aeroband_address': address}))
+        except OSError as e:
+            self._log(f"Could not save device cache: {e}")
+    
+    @Slot()
+    def _schedule_reconnect(self):
+        """Retry the Aeroband scan with exponential backoff (5s doubling up to 60s)"""
+        self._log(f"Retrying Aeroband scan in {self._retry_delay_ms // 1000} seconds")
+        QTimer.singleShot(self._retry_delay_ms, self.auto_connect_aeroband)
+        self._retry_delay_ms = min(self._retry_delay_ms * 2, 60_000)
+    
+    def _on_application_state_changed(self, state):
+        """Resume a paused Aeroband scan when the app becomes active again"""
+        if state == Qt.ApplicationState.ApplicationActive and self._scan_paused:
+            self._scan_paused = False
+            self.auto_connect_aeroband()
     
     def on_chord_changed(self, chord_name):
         """Handle chord selection change"""
         self._log(f"Chord changed to: {chord_name}")
+        self._current_chord = chord_name
+        self._last_render_key = None  # set_chord resets the drawn frets
         if chord_name == 'None':
             self.fretboard.set_chord(None)
         else:
             self.fretboard.set_chord(chord_name)
     
-    def on_show_target_changed(self):
-        """Handle show target checkbox change"""
-        show_target = self.show_target_checkbox.isChecked()
-        self.fretboard.set_show_target(show_target)
-    
-    def on_show_next_chord_changed(self):
-        """Handle show next chord checkbox change"""
-        show_next_chord = self.show_next_chord_checkbox.isChecked()
-        self.fretboard.set_show_next_chord(show_next_chord)
-    
-    def on_show_chord_name_changed(self):
-        """Handle show chord name checkbox change"""
-        show_chord_name = self.show_chord_name_checkbox.isChecked()
-        self.fretboard.set_show_chord_name(show_chord_name)
+    def _on_display_flag_changed(self, state=None):
+        """Handle any display checkbox change by pushing all options to the fretboard at once"""
+        flags = 0
+        if self.feedback_checkbox.isChecked():
+            flags |= FLAG_FEEDBACK
+        if self.show_target_checkbox.isChecked():
+            flags |= FLAG_TARGET
+        if self.show_next_chord_checkbox.isChecked():
+            flags |= FLAG_NEXT
+        if self.show_chord_name_checkbox.isChecked():
+            flags |= FLAG_NAME
+        self._display_flags = flags
+        self.fretboard.set_display_flags(flags)
     
     def on_practice_changed(self, practice_name):
         """Handle practice selection change"""
@@ -296,71 +440,99 @@ class GuitarFretboardApp(QMainWindow):
         self.practice_name = practice_name
         
         # Load practice chords
-        print(f"[DEBUG] Available collections: {self.practice_library.get_collection_names()}")
-        print(f"[DEBUG] Requesting collection: '{practice_name}'")
+        self._logger.debug("Available collections: %s", self.practice_library.get_collection_names())
+        self._logger.debug("Requesting collection: '%s'", practice_name)
         collection = self.practice_library.get_collection(practice_name)
-        print(f"[DEBUG] Got collection: {collection}")
+        self._logger.debug("Got collection: %s", collection)
         self.practice_chords = collection or []
-        print(f"[DEBUG] practice_chords populated with {len(self.practice_chords)} chords: {[c.name for c in self.practice_chords]}")
+        self._logger.debug("practice_chords populated with %d chords: %s",
+                           len(self.practice_chords), [c.name for c in self.practice_chords])
         self.current_practice_idx = 0
         
         # Update chord list widget
         self.chord_list_widget.set_chords(self.practice_chords)
         self._load_next_practice_chord()
     
+    @Slot(int, int)
     def on_note_pressed(self, string, fret):
         """Handle MIDI note on"""
-        print(f"Note Pressed: String {string}, Fret {fret}")
+        if TRACE:
+            self._logger.debug("Note Pressed: String %d, Fret %d", string, fret)
         # Reset the chord detection timer whenever a string is struck
         self.chord_timer.stop()
         self.chord_timer.start(self.chord_timeout_ms)
 
         self.guitar_state.strike_string(string, fret)
         self.guitar_state.press_fret(string, fret)
-        print(f"Current Guitar State: {self.guitar_state.get_summary()}")
-        self._state_changed()
+        if TRACE:
+            self._logger.debug("Current Guitar State: %s", self.guitar_state.get_summary())
+        self._apply_delta(string)
     
+    @Slot(int)
     def on_note_released(self, string):
         """Handle MIDI note off"""
-        print(f"Note Released: String {string}")
+        if TRACE:
+            self._logger.debug("Note Released: String %d", string)
         self.guitar_state.release_string(string)  
-        print(f"Current Guitar State: {self.guitar_state.get_summary()}")
-        self._state_changed()
+        if TRACE:
+            self._logger.debug("Current Guitar State: %s", self.guitar_state.get_summary())
+        self._apply_delta(string)
     
+    @Slot(int, int)
     def on_fret_pressed(self, string, fret):
         """Handle fret pressed event"""
-        print(f"Fret Pressed: String {string}, Fret {fret}")
+        if TRACE:
+            self._logger.debug("Fret Pressed: String %d, Fret %d", string, fret)
         self.guitar_state.press_fret(string, fret)
-        self._state_changed()
+        self._apply_delta(string)
 
+    @Slot(int, int)
     def on_fret_released(self, string, fret):
         """Handle fret released event"""
-        print(f"Fret Released: String {string}, Fret {fret}")
+        if TRACE:
+            self._logger.debug("Fret Released: String %d, Fret %d", string, fret)
         self.guitar_state.release_fret(string, fret)
-        # Clear feedback when all frets are released
-        if all(f == 0 for f in self.guitar_state.pressed_frets):
-            # If we should advance to next chord, do it now
-            if self.should_advance_chord:
-                self.should_advance_chord = False
-                self.current_practice_idx += 1
-                self._load_next_practice_chord()
-            self.feedback_text = ""
-            self.feedback_color = "green"
+        if not self.guitar_state.fret_word:
+            self._on_all_frets_released()
+        else:
+            self._apply_delta(string)
+
+    def _apply_delta(self, string):
+        """Repaint one string on the fretboard after a live update"""
+        # The fretboard no longer shows what _state_changed() last rendered
+        self._last_render_key = None
+        self.fretboard.apply_delta(string, self.guitar_state.get_fret_pressed(string))
+
+    def _on_all_frets_released(self):
+        """Clear feedback (and advance if the chord was correct) once every fret is released"""
+        # If we should advance to next chord, do it now
+        if self.should_advance_chord:
+            self.should_advance_chord = False
+            self.current_practice_idx += 1
+            self._load_next_practice_chord()
+        self.feedback_text = ""
+        self.feedback_color = "green"
+        # Feedback and possibly the target chord changed - full redraw
         self._state_changed()
 
     def _state_changed(self):
         """Update fretboard display based on guitar state"""
+        # The fretboard only draws feedback while FLAG_FEEDBACK is set
+        feedback = (self.feedback_text, self.feedback_color)
+        
+        # Skip the repaint when nothing visible has changed
+        key = (self.guitar_state.state_key(), feedback)
+        if key == self._last_render_key:
+            return
+        self._last_render_key = key
+        
         self.fretboard.set_guitar_state(self.guitar_state)
-        # Pass feedback to fretboard if checkbox is enabled
-        if self.feedback_checkbox.isChecked():
-            self.fretboard.set_feedback(self.feedback_text, self.feedback_color)
-        else:
-            self.fretboard.set_feedback("", "green")
-        self.fretboard.show()
+        self.fretboard.set_feedback(*feedback)
     
     def _load_next_practice_chord(self):
         """Load the next chord in the practice sequence"""
-        print(f"[DEBUG] _load_next_practice_chord: idx={self.current_practice_idx}, total={len(self.practice_chords)}")
+        self._logger.debug("_load_next_practice_chord: idx=%d, total=%d",
+                           self.current_practice_idx, len(self.practice_chords))
         if self.current_practice_idx < len(self.practice_chords):
             target_chord = self.practice_chords[self.current_practice_idx]
             self._log(f"Practice [{self.current_practice_idx + 1}/{len(self.practice_chords)}]: {target_chord.name}")
@@ -372,6 +544,9 @@ class GuitarFretboardApp(QMainWindow):
             self.fretboard.chord_frets = {0: target_chord.frets}
             self.fretboard.strings_to_strike = target_chord.strings_to_strike
             
+            # The library compiled the target when it was loaded
+            self.verifier.set_target(target_chord.frets, target_chord.strings_to_strike, target_chord.compiled)
+            
             # Set the next chord (if there is one) to display in yellow
             if self.current_practice_idx + 1 < len(self.practice_chords):
                 next_chord = self.practice_chords[self.current_practice_idx + 1]
@@ -385,6 +560,7 @@ class GuitarFretboardApp(QMainWindow):
             self.chord_combo.blockSignals(True)
             self.chord_combo.setCurrentText(target_chord.name)
             self.chord_combo.blockSignals(False)
+            self._current_chord = target_chord.name
         else:
             # Loop back to the beginning
             self._log(f"✓ Completed practice: {self.practice_name}! Restarting...")
@@ -393,8 +569,9 @@ class GuitarFretboardApp(QMainWindow):
 
     def finished_chord(self):
         """Called when chord playing is finished (250ms after last string struck)"""
-        print("Chord finished!")
-        print(f"Final chord state: {self.guitar_state.get_summary()}")
+        self._logger.debug("Chord finished!")
+        if self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug("Final chord state: %s", self.guitar_state.get_summary())
         
         # Get the current target chord
         if self.current_practice_idx < len(self.practice_chords):
@@ -403,25 +580,26 @@ class GuitarFretboardApp(QMainWindow):
             target_frets = target_chord.frets
             target_strings = target_chord.strings_to_strike
         else:
-            current_chord_name = self.chord_combo.currentText()
+            current_chord_name = self._current_chord
             target_frets = None
             target_strings = None
         
         if current_chord_name != 'None' and target_frets is not None:
-            strings_matched, frets_matched = self.verifier.verify(target_frets, target_strings, self.guitar_state)
+            strings_matched, frets_matched = self.verifier.fast_match(target_frets, target_strings, self.guitar_state)
             if frets_matched and strings_matched:
                 print(f"✓ CORRECT: {current_chord_name} played perfectly!")
                 self.feedback_text = "CORRECT"
                 self.feedback_color = "green"
                 # If feedback is not enabled, advance immediately
                 # Otherwise, set flag to advance after frets are released
-                if self.feedback_checkbox.isChecked():
+                if self._display_flags & FLAG_FEEDBACK:
                     self.should_advance_chord = True
                 else:
                     self.current_practice_idx += 1
                     QTimer.singleShot(500, self._load_next_practice_chord)
             else:
-                errors = self.verifier.get_errors()
+                # Detailed errors are only built on the incorrect path
+                errors = self.verifier.compute_errors(target_frets, self.guitar_state)
                 print(f"✗ INCORRECT: {current_chord_name}")
                 for string_idx, error in errors.items():
                     print(f"  {error}")
@@ -438,17 +616,9 @@ class GuitarFretboardApp(QMainWindow):
         """Clean up on close"""
         if self.midi_handler.running:
             self.midi_handler.stop()
-            if self.midi_thread:
-                try:
-                    # If using QThread, quit and wait
-                    if isinstance(self.midi_thread, QThread):
-                        self.midi_thread.quit()
-                        self.midi_thread.wait(2000)
-                    else:
-                        # Fallback: if a plain thread was used
-                        self.midi_thread.join(timeout=2)
-                except Exception:
-                    pass
+            # Let the listener stop notifications and disconnect before the loop goes away
+            self.midi_handler.wait_stopped(0.5)
+        self.ble_loop.call_soon_threadsafe(self.ble_loop.stop)
         event.accept()
     
     def on_device_type_changed(self, device_type):
@@ -1,5 +1,8 @@
 """MIDI input handling for both standard MIDI and Bluetooth LE (Aeroband)"""
 import asyncio
+import logging
+import struct
+from collections import deque
 import mido
 from PySide6.QtCore import Signal, QObject
 
@@ -9,6 +12,93 @@ try:
 except ImportError:
     BLEAK_AVAILABLE = False
 
+# Standard tuning MIDI notes (lowest to highest string): E2, A2, D3, G3, B3, E4
+STANDARD_TUNING = (40, 45, 50, 55, 59, 64)
+# Fret for every (string, note) pair, indexed (string << 7) | note; negative below the open string
+FRET_TABLE = tuple(note - open_note for open_note in STANDARD_TUNING for note in range(128))
+
+# Child of the app's 'winguitar' logger, so WINGUITAR_TRACE also enables these messages
+logger = logging.getLogger('winguitar.midi')
+
+# MIDI channel voice commands (high nibble of the status byte)
+NOTE_OFF = 0x80
+NOTE_ON = 0x90
+CONTROL_CHANGE = 0xB0
+
+# Total message length by status byte (0 = data byte or message we don't frame)
+_MSG_LEN = bytearray(256)
+_MSG_LEN[0x80:0xC0] = b'\x03' * 64  # Note Off, Note On, Polyphonic Pressure, Control Change
+_MSG_LEN[0xC0:0xE0] = b'\x02' * 32  # Program Change, Channel Pressure
+# Status bytes whose messages are queued for the UI (1) - Note Off, Note On, Control Change
+_QUEUED = bytearray(256)
+_QUEUED[0x80:0xA0] = b'\x01' * 32
+_QUEUED[0xB0:0xC0] = b'\x01' * 16
+
+# The two data bytes of a message as one big-endian word: (data1 << 8) | data2
+_DATA_WORD = struct.Struct('>H')
+
+# Note name for every MIDI note number (60 -> 'C4')
+_NOTE_NAMES = tuple(
+    f"{('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B')[note % 12]}{note // 12 - 1}"
+    for note in range(128)
+)
+
+
+def parse_ble_midi(data):
+    """
+    Frame one BLE MIDI notification into packed messages
+    
+    Kept free of handler state so it can be tested on its own or replaced by a
+    compiled implementation with the same signature.
+    
+    Args:
+        data: Notification payload (bytes or bytearray)
+        
+    Returns:
+        List of Note Off, Note On and Control Change messages, each packed as
+        (status << 16) | (data1 << 8) | data2
+    """
+    n = len(data)
+    if n < 3:
+        return []
+    last = n - 1  # Index of the final byte
+    msg_len_table = _MSG_LEN
+    queued_table = _QUEUED
+    unpack_data = _DATA_WORD.unpack_from
+    
+    mv = memoryview(data)
+    # BLE MIDI format has a 2-byte header, then MIDI messages
+    i = 2  # Skip header bytes
+    events = []
+    
+    while i < n:
+        midi_status = mv[i]
+        if i < last and mv[i + 1] & 0x80:
+            # Timestamp byte in front of the next status byte (checked first:
+            # a timestamp can read as any status byte, including SysEx 0xF0)
+            i += 1
+            continue
+        length = msg_len_table[midi_status]
+        
+        if not length:
+            if midi_status == 0xF0:
+                # SysEx - jump straight past the End Of Exclusive byte
+                end = data.find(0xF7, i)
+                i = end + 1 if end >= 0 else n
+                continue
+            # Data byte, system or unknown message, skip
+            i += 1
+            continue
+        if i + length > n:
+            break
+        
+        # Note Off, Note On and Control Change go to the UI; other messages are skipped
+        if queued_table[midi_status]:
+            events.append((midi_status << 16) | unpack_data(mv, i + 1)[0])
+        i += length
+    
+    return events
+
 
 class MIDIHandler(QObject):
     """Handles MIDI input in a separate thread"""
@@ -16,9 +106,9 @@ class MIDIHandler(QObject):
     midi_note_released = Signal(int)  # string, fret
     fret_pressed = Signal(int, int)  # string, fret
     fret_released = Signal(int, int)  # string, fret
+    events_ready = Signal()  # event_ring went from drained to non-empty
 
-    # Standard tuning MIDI notes (lowest to highest string)
-    STANDARD_TUNING = [40, 45, 50, 55, 59, 64]  # E2, A2, D3, G3, B3, E4
+    STANDARD_TUNING = STANDARD_TUNING  # Kept for existing callers; hot paths use the module tuple
     NUM_FRETS = 24
     
     def __init__(self):
@@ -28,34 +118,47 @@ class MIDIHandler(QObject):
         self.use_ble = False
         self.ble_client = None
         self.loop = None
+        self._listen_task = None
+        self._stop_event = None  # Set by stop() to end the BLE listener (bound to self.loop)
+        # Single-producer/single-consumer queue of BLE MIDI messages, each packed as
+        # (status << 16) | (data1 << 8) | data2. Extended once per BLE packet, drained by the UI.
+        self.event_ring = deque(maxlen=512)
+        # True while an events_ready wake-up is queued; the consumer clears it before draining
+        self.wake_pending = False
+        
+    def start_listening_ble(self, device):
+        """Start listening to Aeroband via BLE
         
-    def start_listening_ble(self, device_address):
-        """Start listening to Aeroband via BLE"""
+        Args:
+            device: BLEDevice from a scan, or a Bluetooth address string
+        """
         if not BLEAK_AVAILABLE:
             print("Bleak not available")
             return False
         
         self.use_ble = True
-        self.ble_client = BleakClient(device_address)
+        # Reuse the existing client when reconnecting to the same device
+        address = getattr(device, 'address', device)
+        if self.ble_client is None or self.ble_client.address != address:
+            self.ble_client = BleakClient(device)
         self.running = True
         return True
     
     def listen(self):
-        """Listen for MIDI messages (run in thread)"""
-        if self.use_ble:
-            self.listen_ble()
-        else:
+        """Listen for standard MIDI messages (run in thread); BLE is started with listen_ble()"""
+        if not self.use_ble:
             self.listen_standard()
     
     def midi_to_note_name(self, midi_note):
         """Convert MIDI note number to note name"""
-        notes = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
-        note = notes[midi_note % 12]
-        octave = (midi_note // 12) - 1
-        return f"{note}{octave}"
+        return _NOTE_NAMES[midi_note]
     
     def midi_to_fret_info(self, string, midi_note):
-        return midi_note - self.STANDARD_TUNING[string]  
+        """Convert a MIDI note on a string to a fret number
+        
+        Deprecated for hot paths: subtract STANDARD_TUNING[string] directly instead.
+        """
+        return midi_note - STANDARD_TUNING[string]
     
     def listen_standard(self):
         """Listen for standard MIDI messages"""
@@ -68,113 +171,98 @@ class MIDIHandler(QObject):
                     break
                 
                 if msg.type == 'note_on':
-                    fret_info = self.midi_to_fret_info(msg.note)
-                    note_name = self.midi_to_note_name(msg.note)
-                    if fret_info:
-                        string_idx, fret = fret_info
-                        print(f"Note On: String {string_idx}, Fret {fret}, Note {note_name}")
+                    # The channel selects the string, as on the BLE path
+                    if msg.channel < 6 and logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Note On: String %d, Fret %d, Note %s", msg.channel,
+                                     msg.note - STANDARD_TUNING[msg.channel], _NOTE_NAMES[msg.note])
                     self.midi_note_received.emit(msg.note, msg.velocity)
                 elif msg.type == 'note_off':
-                    fret_info = self.midi_to_fret_info(msg.note)
-                    note_name = self.midi_to_note_name(msg.note)
-                    if fret_info:
-                        string_idx, fret = fret_info
-                        print(f"Note Off: String {string_idx}, Fret {fret}, Note {note_name}")
+                    if msg.channel < 6 and logger.isEnabledFor(logging.DEBUG):
+                        logger.debug("Note Off: String %d, Fret %d, Note %s", msg.channel,
+                                     msg.note - STANDARD_TUNING[msg.channel], _NOTE_NAMES[msg.note])
                     self.midi_note_released.emit(msg.note)
         except Exception as e:
             print(f"MIDI listening error: {e}")
     
-    def listen_ble(self):
-        """Listen for Aeroband BLE MIDI messages"""
+    async def listen_ble(self):
+        """Start listening for Aeroband BLE MIDI as a task on the running loop
+        
+        The caller's loop (the app's BLE loop) also runs the scans, so bleak's
+        state stays on one loop. Returns once the listener task is created.
+        """
+        previous = self._listen_task
+        if previous is not None and not previous.done():
+            # Stop the listener from an earlier connection before starting a new one
+            self._request_stop()
+            await asyncio.wait({previous})
+        self.loop = asyncio.get_running_loop()
+        self._listen_task = self.loop.create_task(self._ble_connect_and_listen())
+    
+    def wait_stopped(self, timeout):
+        """Block until the BLE listener has disconnected, or timeout seconds pass (call from another thread)"""
+        task = self._listen_task
+        if self.loop is None or task is None or task.done():
+            return
+        
+        async def _wait():
+            await asyncio.wait({task}, timeout=timeout)
+        
         try:
-            self.loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(self.loop)
-            self.loop.run_until_complete(self._ble_connect_and_listen())
-        except Exception as e:
-            print(f"BLE listening error: {e}")
+            asyncio.run_coroutine_threadsafe(_wait(), self.loop).result(timeout + 0.1)
+        except Exception:
+            pass
     
     async def _ble_connect_and_listen(self):
         """Connect to Aeroband and listen for MIDI"""
         MIDI_CHAR_UUID = "7772e5db-3868-4112-a1a9-f2669d106bf3"
         MIDI_SERVICE_UUID = "03b80e5a-ede8-4b33-a751-6ce34ec4c700"
         
+        client = self.ble_client
         try:
-            async with self.ble_client as client:
-                print(f"Connected to Aeroband, waiting for MIDI data...")
-                
-                def midi_callback(sender, data):
-                    """Parse MIDI over BLE data from Aeroband"""
-                    if not data or len(data) < 3:
-                        return
-                    
-                    try:
-                        # BLE MIDI format has a 2-byte header, then MIDI messages
-                        i = 2  # Skip header bytes
-                        
-                        while i < len(data):
-                            midi_status = data[i]
-                            command = midi_status & 0xF0
-                            string = midi_status & 0x0F
-                            
-                            # Filter system messages
-                            if command == 0xF0:  # System exclusive
-                                i += 1
-                                continue
-                            # print(f"MIDI Status: {midi_status:02x}, Command: {command:02x}, String: {string}")
-                            # 3-byte messages: Note On (0x90), Note Off (0x80), CC (0xB0), Polyphonic Pressure (0xA0)
-                            if command in [0x80, 0x90, 0xA0, 0xB0]:
-                                if i + 2 >= len(data):
-                                    break
-
-                                note = data[i + 1]
-
-                                fret = self.midi_to_fret_info(string, note)
-
-                                velocity = data[i + 2]
-                                
-                                if command == 0x90:  # Note On
-                                    if velocity > 0:
-                                        self.midi_note_received.emit(5-string, fret)
-                                    else:
-                                        # Note on with velocity 0 = note off
-                                        self.midi_note_released.emit(string)
-                                
-                                elif command == 0x80:  # Note Off
-                                    self.midi_note_released.emit(string)
-                                elif command == 0xB0:  # Control Change
-                                    fret_number = data[i+2]
-                                    if data[i+1] & 0x01:
-                                        self.fret_pressed.emit(string, fret_number)
-                                    else:
-                                        self.fret_released.emit(string, fret_number)
-
-                                i += 3
-                            
-                            # 2-byte messages: Program Change (0xC0), Channel Pressure (0xD0)
-                            elif command in [0xC0, 0xD0]:
-                                if i + 1 >= len(data):
-                                    break
-                                i += 2
-                            
-                            else:
-                                # Unknown message, skip
-                                i += 1
-                    
-                    except Exception as e:
-                        print(f"Error parsing MIDI: {e}")
+            if not client.is_connected:
+                await client.connect()
+            print(f"Connected to Aeroband, waiting for MIDI data...")
+            
+            # Bound once so the callback closes over locals instead of looking up attributes per packet
+            parse = parse_ble_midi
+            ring_extend = self.event_ring.extend
+            wake = self.events_ready.emit
+            
+            def midi_callback(sender, data):
+                """Queue the MIDI messages from one Aeroband notification for the UI"""
+                try:
+                    events = parse(data)
+                except Exception as e:
+                    print(f"Error parsing MIDI: {e}")
+                    return
                 
+                if events:
+                    ring_extend(events)
+                    # One queued wake-up per drain, however many packets arrive before it runs
+                    if not self.wake_pending:
+                        self.wake_pending = True
+                        wake()
+            
+            self._stop_event = asyncio.Event()
+            try:
                 await client.start_notify(MIDI_CHAR_UUID, midi_callback)
                 print("MIDI notifications started")
                 
-                # Keep listening
-                while self.running:
-                    await asyncio.sleep(0.1)
-                
+                # Sleep until stop() sets the event; notifications are delivered meanwhile
+                if self.running:
+                    await self._stop_event.wait()
+            finally:
+                self._stop_event = None
                 try:
                     await client.stop_notify(MIDI_CHAR_UUID)
                 except:
                     pass
-                    
+                # Disconnect explicitly; the client object is kept for reconnects
+                try:
+                    await client.disconnect()
+                except:
+                    pass
+                
         except Exception as e:
             print(f"BLE connection error: {e}")
             self.running = False
@@ -184,8 +272,15 @@ class MIDIHandler(QObject):
         self.running = False
         if self.input_port:
             self.input_port.close()
-        if self.loop:
+        if self.loop and self._listen_task:
             try:
-                self.loop.call_soon_threadsafe(self.loop.stop)
+                self.loop.call_soon_threadsafe(self._request_stop)
             except:
                 pass
+    
+    def _request_stop(self):
+        """Wake the BLE listener, or abort a connection still in progress (runs on self.loop)"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        elif not self._listen_task.done():
+            self._listen_task.cancel()
@@ -4,73 +4,92 @@ Loads and manages chord collections from custom_chords.json and configuration
 """
 
 import json
-from typing import Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
 from pathlib import Path
 from target_chord import TargetChord
+from ChordVerifier import ChordVerifier
 from config import CHORD_SHAPES
 
+# Default custom_chords.json next to this script, resolved once at import
+_SCRIPT_DIR = Path(__file__).resolve().parent
+_DEFAULT_CUSTOM_CHORDS = _SCRIPT_DIR / "custom_chords.json"
+
+# orjson is optional; its JSONDecodeError subclasses json.JSONDecodeError
+try:
+    import orjson as _json
+except ImportError:
+    _json = json
+
+
+@lru_cache(maxsize=8)
+def _load_json(path: str, mtime_ns: int) -> Any:
+    """Parse a JSON file, reusing the result until the file's modification time changes"""
+    return _json.loads(Path(path).read_bytes())
+
 
 class PracticeLibrary:
     """Manages chord collections loaded from JSON configuration files"""
     
-    def __init__(self, custom_chords_path: str = None):
+    def __init__(self, custom_chords_path: Optional[Union[str, Path]] = None) -> None:
         """
         Initialize the Practice Library
         
         Args:
             custom_chords_path: Path to custom_chords.json file (defaults to script directory)
         """
-        # Get the directory where this script is located
-        script_dir = Path(__file__).parent
-        
         # Use provided path or default to file in the script directory
         if custom_chords_path is None:
-            custom_chords_path = script_dir / "custom_chords.json"
+            self.custom_chords_path = _DEFAULT_CUSTOM_CHORDS
         else:
-            custom_chords_path = Path(custom_chords_path)
+            self.custom_chords_path = Path(custom_chords_path)
         
-        self.custom_chords_path = custom_chords_path
         self.chord_shapes: Dict[str, List[int]] = CHORD_SHAPES
         self.collections: Dict[str, List[TargetChord]] = {}
+        self._chord_index: Dict[str, TargetChord] = {}  # The shared TargetChord for each name
         
         self._load_collections()
     
-    def _load_chord_shapes(self) -> None:
-        """Load chord shapes from guitar configuration file"""
-    
     def _load_collections(self) -> None:
         """Load chord collections from custom_chords.json"""
         try:
-            with open(self.custom_chords_path, 'r') as f:
-                data = json.load(f)
-                print(f"[PracticeLibrary] Loaded {len(data)} collections from custom_chords.json")
-                print(f"[PracticeLibrary] Using {len(self.chord_shapes)} chord shapes from config.py")
-                
-                for collection_name, chord_names in data:
-                    target_chords = []
-                    missing_chords = []
-                    for chord_name in chord_names:
-                        if chord_name in self.chord_shapes:
-                            frets = self.chord_shapes[chord_name]
-                            # Determine which strings should be struck (not -1)
-                            strings_to_strike = [i for i, fret in enumerate(frets) if fret != -1]
-                            target_chord = TargetChord(chord_name, frets, strings_to_strike)
-                            target_chords.append(target_chord)
-                        else:
-                            missing_chords.append(chord_name)
-                    
-                    # Add collection even if some chords are missing
-                    if target_chords:
-                        self.collections[collection_name] = target_chords
-                        if missing_chords:
-                            print(f"Warning: Collection '{collection_name}' missing chord shapes for: {missing_chords}")
+            path = self.custom_chords_path
+            data = _load_json(str(path), path.stat().st_mtime_ns)
+            print(f"[PracticeLibrary] Loaded {len(data)} collections from custom_chords.json")
+            print(f"[PracticeLibrary] Using {len(self.chord_shapes)} chord shapes from config.py")
+            
+            for collection_name, chord_names in data:
+                target_chords = []
+                missing_chords = []
+                for chord_name in chord_names:
+                    target_chord = self._chord_index.get(chord_name)
+                    if target_chord is None and chord_name in self.chord_shapes:
+                        frets = self.chord_shapes[chord_name]
+                        # Determine which strings should be struck (not -1)
+                        strings_to_strike = tuple(i for i, fret in enumerate(frets) if fret != -1)
+                        target_chord = TargetChord(chord_name, frets, strings_to_strike)
+                        # Collections are static, so compile the verification masks up front
+                        target_chord.compiled = ChordVerifier.compile_target(frets, strings_to_strike, target_chord.strings_mask)
+                        # Chords are never modified, so one instance is shared by every collection
+                        self._chord_index[chord_name] = target_chord
+                    if target_chord is not None:
+                        target_chords.append(target_chord)
                     else:
-                        print(f"Error: Collection '{collection_name}' has NO valid chords loaded. All requested: {chord_names}")
+                        missing_chords.append(chord_name)
                 
-                print(f"[PracticeLibrary] Successfully loaded {len(self.collections)} collections: {list(self.collections.keys())}")
+                # Add collection even if some chords are missing
+                if target_chords:
+                    self.collections[collection_name] = target_chords
+                    if missing_chords:
+                        print(f"Warning: Collection '{collection_name}' missing chord shapes for: {missing_chords}")
+                else:
+                    print(f"Error: Collection '{collection_name}' has NO valid chords loaded. All requested: {chord_names}")
+            
+            print(f"[PracticeLibrary] Successfully loaded {len(self.collections)} collections: {list(self.collections.keys())}")
         except (FileNotFoundError, json.JSONDecodeError) as e:
             print(f"Error loading custom chords: {e}")
             self.collections = {}
+            self._chord_index = {}
     
     def get_collection(self, collection_name: str) -> Optional[List[TargetChord]]:
         """
@@ -112,11 +131,7 @@ class PracticeLibrary:
         Returns:
             TargetChord if found, None otherwise
         """
-        for chords in self.collections.values():
-            for chord in chords:
-                if chord.name == chord_name:
-                    return chord
-        return None
+        return self._chord_index.get(chord_name)
     
     def collection_count(self) -> int:
         """
@@ -134,14 +149,7 @@ class PracticeLibrary:
         Returns:
             Total chord count
         """
-        total = 0
-        seen = set()
-        for chords in self.collections.values():
-            for chord in chords:
-                if chord.name not in seen:
-                    total += 1
-                    seen.add(chord.name)
-        return total
+        return len(self._chord_index)
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"PracticeLibrary(collections={self.collection_count()}, total_chords={self.total_chords()})"
@@ -3,24 +3,39 @@ Target Chord
 Represents a target chord with frets, name, and strings to be struck
 """
 
-from typing import List
+from typing import Optional, Sequence, Tuple
 
 
 class TargetChord:
     """Represents a target chord with frets, name, and strings to be struck"""
     
-    def __init__(self, name: str, frets: List[int], strings_to_strike: List[int]):
+    # Chords are shared across collections and never grow new attributes
+    __slots__ = ('name', 'frets', 'strings_to_strike', 'strings_mask', 'compiled')
+    
+    name: str
+    frets: Tuple[int, ...]
+    strings_to_strike: Tuple[int, ...]
+    strings_mask: int
+    compiled: Optional[Tuple[int, int, int, int]]
+    
+    def __init__(self, name: str, frets: Sequence[int], strings_to_strike: Sequence[int]) -> None:
         """
         Initialize a TargetChord
         
         Args:
             name: The name of the chord (e.g., 'E Major')
-            frets: List of fret positions for each string (e.g., [0, 2, 2, 1, 0, 0])
-            strings_to_strike: List of string indices that should be struck (0-5)
+            frets: Fret positions for each string (e.g., [0, 2, 2, 1, 0, 0]), stored as a tuple
+            strings_to_strike: String indices that should be struck (0-5), stored as a tuple
         """
         self.name = name
-        self.frets = frets
-        self.strings_to_strike = strings_to_strike
+        self.frets = tuple(frets)
+        self.strings_to_strike = tuple(strings_to_strike)
+        # Bit i set when string i should be struck
+        self.strings_mask = 0
+        for string_idx in strings_to_strike:
+            self.strings_mask |= 1 << string_idx
+        # Bitmasks from ChordVerifier.compile_target(), filled in once when the chord is loaded
+        self.compiled = None
     
-    def __repr__(self):
+    def __repr__(self) -> str:
         return f"TargetChord(name='{self.name}', frets={self.frets}, strings_to_strike={self.strings_to_strike})"
@@ -0,0 +1,85 @@
+"""
+Test suite for ChordVerifier
+Verifies chord matching against the packed GuitarState representation
+"""
+
+import unittest
+from guitar import GuitarState
+from ChordVerifier import ChordVerifier
+from target_chord import TargetChord
+
+
+class TestChordVerifier(unittest.TestCase):
+    """Tests for the ChordVerifier class"""
+
+    # E major, indexed low E first: [0, 2, 2, 1, 0, 0]
+    E_FRETS = [0, 2, 2, 1, 0, 0]
+    E_STRINGS = [0, 1, 2, 3, 4, 5]
+
+    def setUp(self):
+        """Create a fresh verifier and guitar state before each test"""
+        self.verifier = ChordVerifier()
+        self.state = GuitarState()
+
+    def _play(self, frets):
+        """Press and strike every string of a chord given low E first"""
+        for string_idx, fret in enumerate(frets):
+            if fret == -1:
+                continue
+            self.state.press_fret(5 - string_idx, fret)
+            self.state.strike_string(5 - string_idx, fret)
+
+    def test_correct_chord(self):
+        """Test that playing the target chord matches both frets and strings"""
+        self._play(self.E_FRETS)
+        self.assertEqual(self.verifier.verify(self.E_FRETS, self.E_STRINGS, self.state), (True, True))
+
+    def test_wrong_fret(self):
+        """Test that a fret on the wrong position fails fret matching only"""
+        self._play([0, 2, 3, 1, 0, 0])
+        self.assertEqual(self.verifier.verify(self.E_FRETS, self.E_STRINGS, self.state), (False, True))
+
+    def test_missing_string(self):
+        """Test that an unstruck required string fails string matching"""
+        self._play(self.E_FRETS)
+        self.state.clear_strings()
+        self.state.strike_string(0, 0)
+        self.assertEqual(self.verifier.verify(self.E_FRETS, self.E_STRINGS, self.state), (True, False))
+
+    def test_muted_string_struck(self):
+        """Test that striking a muted string fails string matching"""
+        d_frets = [2, 2, 2, 0, -1, -1]
+        d_strings = [0, 1, 2, 3]
+        self._play(d_frets)
+        self.assertEqual(self.verifier.verify(d_frets, d_strings, self.state), (True, True))
+        self.state.strike_string(0, 0)
+        self.assertEqual(self.verifier.verify(d_frets, d_strings, self.state), (True, False))
+
+    def test_released_fret(self):
+        """Test that releasing a fret is reflected in verification"""
+        self._play(self.E_FRETS)
+        self.state.release_fret(4, 2)
+        self.assertEqual(self.verifier.verify(self.E_FRETS, self.E_STRINGS, self.state), (False, True))
+
+    def test_fast_match_and_errors(self):
+        """Test that fast_match reports (strings, frets) and errors are only built on demand"""
+        self._play([0, 2, 3, 1, 0, 0])
+        self.assertEqual(self.verifier.fast_match(self.E_FRETS, self.E_STRINGS, self.state), (True, False))
+        errors = ChordVerifier.compute_errors(self.E_FRETS, self.state)
+        self.assertEqual(list(errors), [3])
+
+
+    def test_compile_target_strings_mask(self):
+        """Test that compiling from TargetChord.strings_mask matches compiling from the string list"""
+        d_frets = [2, 2, 2, 0, -1, -1]
+        d_strings = [0, 1, 2, 3]
+        chord = TargetChord('D', d_frets, d_strings)
+        self.assertEqual(chord.strings_mask, 0b001111)
+        compiled = ChordVerifier.compile_target(d_frets, d_strings, chord.strings_mask)
+        self.assertEqual(compiled, ChordVerifier.compile_target(d_frets, d_strings))
+        # Guitar strings are indexed high E first: the muted chord strings 4 and 5 are forbidden
+        self.assertEqual(compiled[2:], (0b111100, 0b000011))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
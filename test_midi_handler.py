@@ -0,0 +1,64 @@
+"""
+Test suite for parse_ble_midi
+Frames BLE MIDI notifications into packed (status << 16) | (data1 << 8) | data2 messages
+"""
+
+import unittest
+from midi_handler import parse_ble_midi
+
+
+def _packed(status, data1, data2):
+    """Pack one message the way parse_ble_midi returns it"""
+    return (status << 16) | (data1 << 8) | data2
+
+
+class TestParseBleMidi(unittest.TestCase):
+    """Tests for the parse_ble_midi function"""
+
+    def test_short_packet(self):
+        """Test that packets without a message are ignored"""
+        self.assertEqual(parse_ble_midi(b''), [])
+        self.assertEqual(parse_ble_midi(bytes([0x80, 0x81])), [])
+
+    def test_note_on(self):
+        """Test a single Note On after the header"""
+        data = bytes([0x80, 0x81, 0x90, 0x40, 0x7F])
+        self.assertEqual(parse_ble_midi(data), [_packed(0x90, 0x40, 0x7F)])
+
+    def test_timestamped_messages(self):
+        """Test that a timestamp byte before each later message is skipped"""
+        data = bytes([0x80, 0x81, 0x95, 0x40, 0x7F, 0x82, 0xB1, 0x03, 0x05, 0x83, 0x84, 0x40, 0x00])
+        self.assertEqual(parse_ble_midi(data), [
+            _packed(0x95, 0x40, 0x7F),
+            _packed(0xB1, 0x03, 0x05),
+            _packed(0x84, 0x40, 0x00),
+        ])
+
+    def test_timestamp_like_sysex(self):
+        """Test that a 0xF0 timestamp byte is not mistaken for the start of SysEx"""
+        data = bytes([0x80, 0x81, 0x90, 0x40, 0x7F, 0xF0, 0x80, 0x41, 0x00])
+        self.assertEqual(parse_ble_midi(data), [_packed(0x90, 0x40, 0x7F), _packed(0x80, 0x41, 0x00)])
+
+    def test_sysex_skipped(self):
+        """Test that a SysEx message is skipped up to its End Of Exclusive byte"""
+        data = bytes([0x80, 0x81, 0xF0, 0x01, 0x02, 0x82, 0xF7, 0x83, 0x90, 0x40, 0x7F])
+        self.assertEqual(parse_ble_midi(data), [_packed(0x90, 0x40, 0x7F)])
+
+    def test_unqueued_messages_skipped(self):
+        """Test that Program Change and Polyphonic Pressure are framed but not returned"""
+        data = bytes([0x80, 0x81, 0xC0, 0x05, 0x82, 0xA0, 0x40, 0x10, 0x83, 0xB0, 0x01, 0x02])
+        self.assertEqual(parse_ble_midi(data), [_packed(0xB0, 0x01, 0x02)])
+
+    def test_incomplete_message(self):
+        """Test that a truncated message at the end of the packet is dropped"""
+        data = bytes([0x80, 0x81, 0x90, 0x40, 0x7F, 0x82, 0x90, 0x41])
+        self.assertEqual(parse_ble_midi(data), [_packed(0x90, 0x40, 0x7F)])
+
+    def test_bytearray_input(self):
+        """Test that bytearray notifications (as delivered by bleak) parse the same as bytes"""
+        data = bytearray([0x80, 0x81, 0x90, 0x40, 0x7F])
+        self.assertEqual(parse_ble_midi(data), [_packed(0x90, 0x40, 0x7F)])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -5,14 +5,16 @@ Verifies that practices load correctly from custom_chords.json
 
 import unittest
 from practice_library import PracticeLibrary
+from ChordVerifier import ChordVerifier
 
 
 class TestPracticeLibrary(unittest.TestCase):
     """Tests for the PracticeLibrary class"""
     
-    def setUp(self):
-        """Initialize PracticeLibrary before each test"""
-        self.library = PracticeLibrary()
+    @classmethod
+    def setUpClass(cls):
+        """Load the PracticeLibrary once; the tests only read from it"""
+        cls.library = PracticeLibrary()
     
     def test_load_collections(self):
         """Test that all collections load from custom_chords.json"""
@@ -47,6 +49,14 @@ class TestPracticeLibrary(unittest.TestCase):
                           "No chord shapes loaded from guitar config")
         print(f"✓ Loaded {len(self.library.chord_shapes)} chord shapes")
     
+    def test_chords_precompiled(self):
+        """Test that every loaded chord carries its compiled verification masks"""
+        for name in self.library.get_collection_names():
+            for chord in self.library.get_collection(name):
+                self.assertEqual(chord.compiled,
+                                 ChordVerifier.compile_target(chord.frets, chord.strings_to_strike),
+                                 f"Chord '{chord.name}' in '{name}' is not compiled")
+    
     def test_get_collection_by_name(self):
         """Test retrieving specific collection by name"""
         all_chords = self.library.get_collection("All Chords")
@@ -54,6 +64,14 @@ class TestPracticeLibrary(unittest.TestCase):
         self.assertEqual(len(all_chords), 24, "All Chords collection should have 24 chords")
         print(f"✓ All Chords collection retrieved: {len(all_chords)} chords")
     
+    def test_get_chord_index(self):
+        """Test that get_chord and total_chords agree with the loaded collections"""
+        names = {chord.name for chords in self.library.get_all_collections().values() for chord in chords}
+        self.assertEqual(self.library.total_chords(), len(names))
+        for name in names:
+            self.assertEqual(self.library.get_chord(name).name, name)
+        self.assertIsNone(self.library.get_chord("No Such Chord"))
+    
     def test_collection_details(self):
         """Test details of each collection"""
         print("\n✓ Collection Details:")
@@ -0,0 +1,93 @@
+"""
+Test suite for the Windows Aeroband debugger parsers
+Checks that the fast and tracing parsers frame BLE MIDI notifications identically
+"""
+
+import logging
+import random
+import sys
+import types
+import unittest
+
+# The parsers don't touch Bluetooth; stub bleak so the script imports without it
+if 'bleak' not in sys.modules:
+    sys.modules['bleak'] = types.SimpleNamespace(BleakClient=None, BleakScanner=None)
+
+from windows_aeroband_debug import MIDIDebugger
+
+
+class TestParseMidiMessages(unittest.TestCase):
+    """Tests for MIDIDebugger._parse_fast and MIDIDebugger._parse_debug"""
+
+    def _parse_both(self, data):
+        """Parse a packet with both variants, failing if they disagree"""
+        fast = list(MIDIDebugger._parse_fast(data))
+        self.assertEqual(fast, list(MIDIDebugger._parse_debug(data)), data.hex(' '))
+        return fast
+
+    def test_short_packet(self):
+        """Test that packets without a message are ignored"""
+        self.assertEqual(self._parse_both(b''), [])
+        self.assertEqual(self._parse_both(bytes([0x80, 0x80])), [])
+
+    def test_note_on(self):
+        """Test that Note On numbers strings reversed and maps the note to a fret"""
+        self.assertEqual(self._parse_both(bytes([0x80, 0x80, 0x95, 0x40, 0x7F])), [(0x90, 0, 4, 64, 1)])
+
+    def test_note_off(self):
+        """Test that Note Off is reported as a release"""
+        self.assertEqual(self._parse_both(bytes([0x80, 0x80, 0x83, 0x3C, 0x00])), [(0x80, 2, 0, 60, 0)])
+
+    def test_control_change(self):
+        """Test that Control Change uses the channel as the string and data2 as the fret"""
+        self.assertEqual(self._parse_both(bytes([0x80, 0x80, 0xB1, 0x03, 0x05])), [(0xB0, 1, 5, 65, 1)])
+        self.assertEqual(self._parse_both(bytes([0x80, 0x80, 0xB1, 0x02, 0x05])), [(0xB0, 1, 5, 65, 0)])
+
+    def test_two_byte_messages(self):
+        """Test that Program Change and Channel Pressure are framed as 2-byte messages"""
+        data = bytes([0x80, 0x80, 0xC5, 0x05, 0xD2, 0x40, 0x95, 0x40, 0x7F])
+        self.assertEqual(self._parse_both(data), [(0xC0, 0, 0, 0, 0), (0xD0, 3, 0, 0, 0), (0x90, 0, 4, 64, 1)])
+
+    def test_truncated_message(self):
+        """Test that an incomplete message at the end of the packet is dropped"""
+        self.assertEqual(self._parse_both(bytes([0x80, 0x80, 0x90, 0x40])), [])
+        data = bytes([0x80, 0x80, 0x95, 0x40, 0x7F, 0xB1, 0x03])
+        self.assertEqual(self._parse_both(data), [(0x90, 0, 4, 64, 1)])
+
+    def test_random_packets_match(self):
+        """Test that both variants agree on random packets"""
+        rng = random.Random(1234)
+        for _ in range(5000):
+            data = bytes(rng.randrange(256) for _ in range(rng.randrange(20)))
+            self._parse_both(data)
+
+
+
+class TestHandlePacket(unittest.TestCase):
+    """Tests for MIDIDebugger.handle_packet"""
+
+    def _shown(self, debugger, data):
+        """Return the message lines handle_packet logs for one packet"""
+        with self.assertLogs('windows_aeroband_debug', 'INFO') as logs:
+            # assertLogs needs at least one record; the marker is filtered out below
+            logging.getLogger('windows_aeroband_debug').info('-')
+            debugger.handle_packet(data)
+        lines = '\n'.join(record.getMessage() for record in logs.records[1:]).splitlines()
+        return [line for line in lines if line.startswith('[')]
+
+    def test_repeated_state_skipped(self):
+        """Test that a message repeating the last state of its command and string is not shown"""
+        debugger = MIDIDebugger()
+        self.assertEqual(len(self._shown(debugger, bytes([0x80, 0x80, 0x85, 0x30, 0x00]))), 1)
+        self.assertEqual(self._shown(debugger, bytes([0x80, 0x80, 0x85, 0x30, 0x00])), [])
+
+    def test_other_command_not_skipped(self):
+        """Test that messages of another command on the same string are still shown"""
+        debugger = MIDIDebugger()
+        # Program Change on channel 5 and Note Off on channel 5 both land on string 0
+        self.assertEqual(len(self._shown(debugger, bytes([0x80, 0x80, 0xC5, 0x05]))), 1)
+        self.assertEqual(len(self._shown(debugger, bytes([0x80, 0x80, 0x85, 0x30, 0x00]))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -5,41 +5,57 @@ Requires: pip install bleak
 
 import asyncio
 import argparse
+import logging
+import signal
+import struct
+import sys
 from bleak import BleakClient, BleakScanner
 
 # Aeroband UUIDs (standard MIDI service)
 MIDI_SERVICE_UUID = "03b80e5a-ede8-4b33-a751-6ce34ec4c700"
 MIDI_CHAR_UUID = "7772e5db-3868-4112-a1a9-f2669d106bf3"
+# Give up scanning if no Aeroband has advertised within this many seconds
+SCAN_TIMEOUT = 10.0
+
+# Per-message output is INFO; the raw packet trace is DEBUG (enable with -v)
+log = logging.getLogger(__name__)
+
+# Message length by status high nibble: 3 for Note Off/On, Poly Pressure and
+# Control Change, 2 for Program Change and Channel Pressure, 0 for anything else
+LEN_BY_HIGH = (0, 0, 0, 0, 0, 0, 0, 0, 3, 3, 3, 3, 2, 2, 0, 0)
+
+# Command (high nibble) and string number for every status byte. Control Change
+# carries the string directly in its channel; other messages number strings reversed.
+CMD_LUT = bytes(b & 0xF0 for b in range(256))
+STRING_LUT = tuple(b & 0x0F if b & 0xF0 == 0xB0 else 5 - (b & 0x0F) for b in range(256))
+
+# A whole 3-byte message (status, data1, data2) in one C call
+_UNPACK3 = struct.Struct('BBB').unpack_from
+
+# Hex text for every byte value, used in place of hex() in the output
+CMD_HEX = tuple(f'0x{c:02x}' for c in range(256))
+
+# One INFO line per message: count, action, string, fret, note name, MIDI note, command
+LINE_FMT = '[{:04d}] {} - String:{} Fret:{:2d} Note:{:5s} (MIDI:{:3d}) Cmd:{}'.format
+
+# Note name for every MIDI note number (60 -> 'C4')
+NOTE_NAMES = tuple(f'{name}{octave}' for octave in range(-1, 10)
+                   for name in ('C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B'))[:128]
 
 
 class MIDIDebugger:
     def __init__(self):
         self.client = None
-        self.note_names = {
-            0: 'C-1', 1: 'C#-1', 2: 'D-1', 3: 'D#-1', 4: 'E-1', 5: 'F-1',
-            6: 'F#-1', 7: 'G-1', 8: 'G#-1', 9: 'A-1', 10: 'A#-1', 11: 'B-1',
-            12: 'C0', 13: 'C#0', 14: 'D0', 15: 'D#0', 16: 'E0', 17: 'F0',
-            18: 'F#0', 19: 'G0', 20: 'G#0', 21: 'A0', 22: 'A#0', 23: 'B0',
-            24: 'C1', 25: 'C#1', 26: 'D1', 27: 'D#1', 28: 'E1', 29: 'F1',
-            30: 'F#1', 31: 'G1', 32: 'G#1', 33: 'A1', 34: 'A#1', 35: 'B1',
-            36: 'C2', 37: 'C#2', 38: 'D2', 39: 'D#2', 40: 'E2', 41: 'F2',
-            42: 'F#2', 43: 'G2', 44: 'G#2', 45: 'A2', 46: 'A#2', 47: 'B2',
-            48: 'C3', 49: 'C#3', 50: 'D3', 51: 'D#3', 52: 'E3', 53: 'F3',
-            54: 'F#3', 55: 'G3', 56: 'G#3', 57: 'A3', 58: 'A#3', 59: 'B3',
-            60: 'C4', 61: 'C#4', 62: 'D4', 63: 'D#4', 64: 'E4', 65: 'F4',
-            66: 'F#4', 67: 'G4', 68: 'G#4', 69: 'A4', 70: 'A#4', 71: 'B4',
-            72: 'C5', 73: 'C#5', 74: 'D5', 75: 'D#5', 76: 'E5', 77: 'F5',
-            78: 'F#5', 79: 'G5', 80: 'G#5', 81: 'A5', 82: 'A#5', 83: 'B5',
-            84: 'C6', 85: 'C#6', 86: 'D6', 87: 'D#6', 88: 'E6', 89: 'F6',
-            90: 'F#6', 91: 'G6', 92: 'G#6', 93: 'A6', 94: 'A#6', 95: 'B6',
-            96: 'C7',
-        }
-        self.frets = [0, 0, 0, 0, 0, 0]
+        self.frets = bytearray(6)  # 1 while a fret is held on that string
         self.message_count = 0
+        # Raw notifications waiting for _consumer(); keeps bleak's callback short
+        self.q = asyncio.Queue(maxsize=256)
+        self._stop = None  # Set by Ctrl+C to end run()
+        self._last = {}  # (command, string) -> (fret, pressed) of the last message shown for it
 
     def get_note_name(self, midi_note):
         """Get friendly note name from MIDI note number"""
-        return self.note_names.get(midi_note, f'Unknown({midi_note})')
+        return NOTE_NAMES[midi_note] if 0 <= midi_note < 128 else f'Unknown({midi_note})'
 
     async def scan_and_connect(self, target_address=None):
         """Scan for and connect to Aeroband guitar
@@ -49,39 +65,67 @@ class MIDIDebugger:
         """
         print("Scanning for Aeroband device...")
 
-        devices = await BleakScanner.discover()
-        aeroband_device = None
+        found = asyncio.Event()
+        seen = set()
+        target = {}
 
-        for device in devices:
-            print(f"Found: {device.name} ({device.address})")
+        def detection_callback(device, advertisement_data):
+            """Stop looking as soon as a matching device advertises"""
+            if found.is_set():
+                return
+            if device.address not in seen:
+                seen.add(device.address)
+                print(f"Found: {device.name} ({device.address})")
             # Match by explicit address first (if provided)
             if target_address and device.address and device.address.lower() == target_address.lower():
-                aeroband_device = device
+                target['device'] = device
                 print(f"  -> Selected by address: {device.name or device.address}")
-                break
-
+                found.set()
             # Fall back to name-based detection
-            if device.name and ("aeroband" in device.name.lower() or "pocketdrum" in device.name.lower()):
-                aeroband_device = device
+            elif device.name and ("aeroband" in device.name.lower() or "pocketdrum" in device.name.lower()):
+                target['device'] = device
                 print(f"  -> Selected: {device.name}")
-                break
+                found.set()
+
+        scanner = BleakScanner(detection_callback=detection_callback)
+        await scanner.start()
+        try:
+            await asyncio.wait_for(found.wait(), SCAN_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            await scanner.stop()
+        aeroband_device = target.get('device')
         
         if not aeroband_device:
             print("Aeroband device not found!")
             return False
         
         print(f"\nConnecting to {aeroband_device.name}...")
-        self.client = BleakClient(aeroband_device.address)
+        # The BLEDevice from the scan lets bleak connect without rescanning
+        self.client = BleakClient(aeroband_device)
         
         try:
             await self.client.connect()
             print("Connected!")
+            await self.report_mtu()
             await self.list_services()
             return True
         except Exception as e:
             print(f"Connection failed: {e}")
             return False
 
+    async def report_mtu(self):
+        """Print the MTU negotiated by the OS (bleak has no portable way to request one)"""
+        backend = getattr(self.client, '_backend', None)
+        if hasattr(backend, '_acquire_mtu'):
+            # BlueZ only: reads the already negotiated MTU so mtu_size reports it
+            try:
+                await backend._acquire_mtu()
+            except Exception as e:
+                print(f"Could not read MTU: {e}")
+        print(f"MTU: {self.client.mtu_size}")
+
     async def list_services(self):
         """List all services and characteristics on the connected device"""
         print("\n=== DEVICE SERVICES & CHARACTERISTICS ===")
@@ -103,107 +147,196 @@ class MIDIDebugger:
         print("\n")
 
     def notification_handler(self, sender, data):
-        """Handle MIDI notifications from the device"""
+        """Queue a MIDI notification from the device for _consumer()"""
         if not data or len(data) < 3:
             return
         
-        # Parse BLE MIDI notification
-        messages = self.parse_midi_messages(data)
+        if self.q.full():
+            # Drop the oldest packet rather than blocking the BLE callback
+            self.q.get_nowait()
+            log.warning("Notification queue full, dropped oldest packet")
+        self.q.put_nowait(bytes(data))
+
+    async def _consumer(self):
+        """Parse and print queued notifications until cancelled"""
+        while True:
+            data = await self.q.get()
+            try:
+                self.handle_packet(data)
+            except Exception:
+                # Lose only the bad packet, not the rest of the session
+                log.exception("Error handling packet %s", data.hex(' '))
+
+    def handle_packet(self, data):
+        """Parse one BLE MIDI notification and print its messages"""
+        show = log.isEnabledFor(logging.INFO)
+        lines = []  # Output for the whole packet, written with one log call
+        last = self._last
+        line_fmt = LINE_FMT
         
-        for msg in messages:
-            command, string_num, fret_num, note, fret_pressed = msg
-            
+        # Parse BLE MIDI notification
+        for command, string_num, fret_num, note, fret_pressed in self.parse_midi_messages(data):
             self.message_count += 1
+            # Devices repeat sustained states; skip a message identical to the last one
+            # of the same command on its string (commands number strings differently)
+            key = (command, string_num)
+            state = (fret_num, fret_pressed)
+            if last.get(key) == state:
+                continue
+            last[key] = state
+            changed = self.frets[string_num] != fret_pressed
             self.frets[string_num] = fret_pressed
             
-            action = "PRESS" if fret_pressed else "RELEASE"
-            note_name = self.get_note_name(note)
-            
-            print(f"[{self.message_count:04d}] {action} - String:{string_num} Fret:{fret_num:2d} Note:{note_name:5s} (MIDI:{note:3d}) Cmd:{hex(command)}")
-            print(f"       Fret States: {self.frets}")
+            if show:
+                action = "PRESS" if fret_pressed else "RELEASE"
+                note_name = self.get_note_name(note)
+                lines.append(line_fmt(self.message_count, action, string_num, fret_num,
+                                      note_name, note, CMD_HEX[command]))
+                if changed:
+                    # Only show the fret states when this message changed them
+                    lines.append(f"       Fret States: {list(self.frets)}")
+        
+        if lines:
+            log.info('\n'.join(lines))
 
     @staticmethod
     def parse_midi_messages(data):
-        """Parse BLE MIDI notification and extract individual MIDI messages"""
-        messages = []
+        """Parse BLE MIDI notification and yield each MIDI message as a tuple
         
-        if not isinstance(data, (bytes, bytearray)):
-            data = bytes(data)
+        Yields (command, string_number, fret_number, note, fret_pressed). The
+        raw packet trace is only produced when DEBUG logging is enabled.
+        `data` must already be bytes, bytearray or memoryview; it is not copied.
+        """
+        if log.isEnabledFor(logging.DEBUG):
+            return MIDIDebugger._parse_debug(data)
+        return MIDIDebugger._parse_fast(data)
+
+    @staticmethod
+    def _parse_fast(data):
+        """parse_midi_messages() without any trace output"""
+        assert isinstance(data, (bytes, bytearray, memoryview))
+        n = len(data)
+        if n < 3:
+            return
+        mv = memoryview(data)
+        # Module tables bound once so the loop uses fast local lookups
+        len_by_high = LEN_BY_HIGH
+        cmd_lut = CMD_LUT
+        string_lut = STRING_LUT
+        unpack3 = _UNPACK3
         
-        if len(data) < 3:
-            return messages
+        i = 2  # Skip BLE header and timestamp
+        while i < n:
+            midi_status = mv[i]
+            msg_len = len_by_high[midi_status >> 4]
+            if not msg_len:
+                # System messages, data bytes and other status bytes
+                i += 1
+                continue
+            if i + msg_len > n:
+                break
+            
+            command = cmd_lut[midi_status]
+            string_number = string_lut[midi_status]
+            if msg_len == 3:
+                _, data1, data2 = unpack3(mv, i)
+                if command == 0x90:
+                    fret_pressed = 1
+                elif command == 0x80:
+                    fret_pressed = 0
+                else:
+                    fret_pressed = data1 & 0x01
+                
+                if command == 0xB0:
+                    fret_number = data2
+                    note = 60 + fret_number  # Simple mapping for demo
+                else:
+                    note = data1
+                    fret_number = note - 60 if note >= 60 else 0
+                
+                i += 3
+                yield (command, string_number, fret_number, note, fret_pressed)
+            else:
+                i += 2
+                yield (command, string_number, 0, 0, 0)
+
+    @staticmethod
+    def _parse_debug(data):
+        """parse_midi_messages() with the raw byte, per-position and per-message trace"""
+        assert isinstance(data, (bytes, bytearray, memoryview))
+        n = len(data)
+        if n < 3:
+            return
+        mv = memoryview(data)
+        debug = log.debug
+        len_by_high = LEN_BY_HIGH
+        cmd_lut = CMD_LUT
+        string_lut = STRING_LUT
+        cmd_hex = CMD_HEX
+        unpack3 = _UNPACK3
         
         # Debug: show raw bytes received
-        hex_str = ' '.join('%02x' % b for b in data)
-        print(f"[RAW DATA] Len={len(data)} Hex: {hex_str}")
+        debug("[RAW DATA] Len=%d Hex: %s", n, data.hex(' '))
         
         i = 2  # Skip BLE header and timestamp
-        msg_count = 0
+        msg_count = 0    # 3-byte messages
+        total_count = 0  # All messages
         
-        while i < len(data):
-            midi_status = data[i]
-            command = midi_status & 0xF0
-            if command == 0xb0:
-                string_number = midi_status & 0x0F    
-            else:
-                string_number = 5 - (midi_status & 0x0F)
+        while i < n:
+            midi_status = mv[i]
+            command = cmd_lut[midi_status]
+            string_number = string_lut[midi_status]
+            
+            debug("[POS %d] Status=%s Cmd=%s String=%d", i, cmd_hex[midi_status], cmd_hex[command], string_number)
             
-            print(f"[POS {i}] Status={hex(midi_status)} Cmd={hex(command)} String={string_number}")
+            msg_len = len_by_high[midi_status >> 4]
+            if not msg_len:
+                # System messages, data bytes and other status bytes
+                debug("  !! Unknown status byte %s at pos %d, skipping", cmd_hex[midi_status], i)
+                i += 1
+                continue
+            
+            # Check we have enough bytes for the whole message
+            if i + msg_len > n:
+                debug("  !! Incomplete %d-byte message at pos %d", msg_len, i)
+                break
             
             # 3-byte messages: Note On (0x90), Note Off (0x80), Polyphonic Pressure (0xA0), Control Change (0xB0)
-            if (command == 0x80 or
-                command == 0x90 or
-                command == 0xA0 or 
-                command == 0xB0):
-                
-                # Check we have enough bytes for a 3-byte message
-                if i + 2 >= len(data):
-                    print(f"  !! Incomplete 3-byte message at pos {i}")
-                    break
-                
+            if msg_len == 3:
+                _, data1, data2 = unpack3(mv, i)
                 # Determine if fret pressed or released
                 if command == 0x90:
                     fret_pressed = 1
                 elif command == 0x80:
                     fret_pressed = 0
                 else:
-                    fret_pressed = data[i+1] & 0x01
+                    fret_pressed = data1 & 0x01
 
                 # Get fret number and note
                 if command == 0xB0:
-                    fret_number = data[i+2]
+                    fret_number = data2
                     # For Windows version, we'll just use the fret number directly
                     # In production, you'd map this using the same logic as the Pico
                     note = 60 + fret_number  # Simple mapping for demo
                 else:
-                    note = data[i+1]
+                    note = data1
                     # Simple reverse calculation for demo
                     fret_number = note - 60 if note >= 60 else 0
 
-                msg = [command, string_number, fret_number, note, fret_pressed]
                 msg_count += 1
-                print(f"  MSG[{msg_count}] Cmd={hex(command)} Str={string_number} Fret={fret_number} Note={note} Press={fret_pressed}")
-                messages.append(msg)
+                total_count += 1
+                debug("  MSG[%d] Cmd=%s Str=%d Fret=%d Note=%d Press=%d",
+                      msg_count, cmd_hex[command], string_number, fret_number, note, fret_pressed)
                 i += 3
+                yield (command, string_number, fret_number, note, fret_pressed)
             
             # 2-byte messages: Program Change (0xC0), Channel Pressure (0xD0)
-            elif (command == 0xC0 or 
-                  command == 0xD0):
-                if i + 1 >= len(data):
-                    print(f"  !! Incomplete 2-byte message at pos {i}")
-                    break
-                    
-                msg = [command, string_number, 0, 0, 0]
-                messages.append(msg)
-                i += 2
-            
-            # System messages and other status bytes
             else:
-                print(f"  !! Unknown status byte {hex(midi_status)} at pos {i}, skipping")
-                i += 1
+                total_count += 1
+                i += 2
+                yield (command, string_number, 0, 0, 0)
         
-        print(f"[PARSED] Total {len(messages)} messages\n")
-        return messages
+        debug("[PARSED] Total %d messages\n", total_count)
 
     async def run(self, target_address=None):
         """Main debug loop
@@ -218,13 +351,24 @@ class MIDIDebugger:
         print("\nListening for MIDI messages...")
         print("Press and release frets to see debug output.\n")
         
+        consumer = None
+        self._stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        try:
+            # Ctrl+C sets the stop event on POSIX; on Windows it still raises
+            # KeyboardInterrupt / cancels run() as before
+            loop.add_signal_handler(signal.SIGINT, self._stop.set)
+            stop_on_signal = True
+        except (NotImplementedError, RuntimeError):
+            stop_on_signal = False
         try:
-            # Subscribe to MIDI notifications
+            # Parse notifications on a separate task, then subscribe
+            consumer = asyncio.create_task(self._consumer())
             await self.client.start_notify(MIDI_CHAR_UUID, self.notification_handler)
             
-            # Keep running until user interrupts
-            while True:
-                await asyncio.sleep(0.1)
+            # Sleep until the user interrupts; notifications are delivered meanwhile
+            await self._stop.wait()
+            print("\n\nDebug stopped by user")
         
         except KeyboardInterrupt:
             print("\n\nDebug stopped by user")
@@ -246,10 +390,14 @@ class MIDIDebugger:
                             print(f"    Properties: {char.properties}")
         
         finally:
+            if stop_on_signal:
+                loop.remove_signal_handler(signal.SIGINT)
             try:
                 await self.client.stop_notify(MIDI_CHAR_UUID)
             except:
                 pass
+            if consumer is not None:
+                consumer.cancel()
             await self.client.disconnect()
             print("Disconnected")
 
@@ -267,7 +415,10 @@ if __name__ == '__main__':
     print("\nMake sure Bluetooth is enabled on your PC.\n")
     parser = argparse.ArgumentParser(description='Windows Aeroband MIDI Debugger')
     parser.add_argument('-a', '--address', help='Bluetooth address of Aeroband (e.g. DB:48:C3:06:41:2B)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Also show the raw packet trace')
     args = parser.parse_args()
+    # stdout, alongside the scan and connect prints, so redirected output keeps the MIDI traffic
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(message)s', stream=sys.stdout)
 
     try:
         asyncio.run(main(args.address))